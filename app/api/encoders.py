@@ -0,0 +1,71 @@
+import json
+from decimal import Decimal
+from django.utils import timezone
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+PRICE_FIELDS = ['symbol', 'timestamp', 'open', 'close', 'high', 'low', 'volume']
+DECIMAL_FIELDS = {'open', 'close', 'high', 'low'}
+DECIMAL_QUANTUM = Decimal('0.0001')
+
+def format_timestamp(value, tz=None):
+    """Render a datetime the way DRF's DateTimeField does under USE_TZ (UTC becomes a 'Z' suffix)."""
+    if value.utcoffset() is not None:
+        value = value.astimezone(tz or timezone.get_current_timezone())
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+def format_decimal(value):
+    return str(value.quantize(DECIMAL_QUANTUM)) if value is not None else None
+
+def price_row_formatter(fields):
+    """Build a function that turns a values_list tuple for `fields` into the serializer's dict shape."""
+    tz = timezone.get_current_timezone()
+    converters = [
+        (lambda value: format_timestamp(value, tz)) if field == 'timestamp'
+        else format_decimal if field in DECIMAL_FIELDS else None
+        for field in fields
+    ]
+
+    def format_row(row):
+        return {
+            field: convert(value) if convert is not None else value
+            for field, convert, value in zip(fields, converters, row)
+        }
+
+    return format_row
+
+def format_column(field, values):
+    if field == 'timestamp':
+        tz = timezone.get_current_timezone()
+        return [format_timestamp(value, tz) for value in values]
+    if field in DECIMAL_FIELDS:
+        return [format_decimal(value) for value in values]
+    return list(values)
+
+def price_rows(queryset, fields=PRICE_FIELDS):
+    """Read-only equivalent of StockPriceSerializer(queryset, many=True).data, built from values_list tuples."""
+    format_row = price_row_formatter(fields)
+    return [format_row(row) for row in queryset.values_list(*fields)]
+
+def price_columns(rows, fields):
+    """Columnar shape of values_list tuples: {"timestamp": [...], "close": [...]}."""
+    columns = list(zip(*rows)) if rows else [()] * len(fields)
+    return {field: format_column(field, values) for field, values in zip(fields, columns)}
+
+def dumps(data):
+    """
+    Encode to JSON bytes with orjson when it is installed.
+
+    Either way the output matches DRF's JSONRenderer byte for byte (compact
+    separators, UTF-8, no ASCII escaping) for the strings and integers the
+    price encoders produce.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
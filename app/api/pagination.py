@@ -0,0 +1,39 @@
+import json
+import base64
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+class InvalidCursor(Exception):
+    pass
+
+def encode_cursor(symbol, timestamp):
+    payload = json.dumps([symbol, timestamp.isoformat()]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        symbol, timestamp = json.loads(base64.urlsafe_b64decode(padded))
+        timestamp = parse_datetime(timestamp)
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor.")
+    if not isinstance(symbol, str) or timestamp is None:
+        raise InvalidCursor("Invalid cursor.")
+    return symbol, timestamp
+
+def keyset_page(queryset, fields, cursor=None, limit=500):
+    """
+    Fetch one page ordered by (symbol, timestamp), continuing after `cursor`.
+
+    Seeks on the composite (symbol, timestamp) index instead of using OFFSET, so
+    every page costs the same. Returns (rows, next_cursor) where rows are
+    values_list tuples for `fields` and next_cursor is None on the last page.
+    """
+    queryset = queryset.order_by('symbol', 'timestamp')
+    if cursor:
+        symbol, timestamp = decode_cursor(cursor)
+        queryset = queryset.filter(Q(symbol__gt=symbol) | Q(symbol=symbol, timestamp__gt=timestamp))
+
+    rows = list(queryset.values_list('symbol', 'timestamp', *fields)[:limit + 1])
+    next_cursor = encode_cursor(rows[limit - 1][0], rows[limit - 1][1]) if len(rows) > limit else None
+    return [row[2:] for row in rows[:limit]], next_cursor
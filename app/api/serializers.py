@@ -1,5 +1,7 @@
+from decimal import Decimal
 from rest_framework import serializers
 from app.core.models import StockPrice, StockPrediction
+from .encoders import PRICE_FIELDS
 
 class StockPriceSerializer(serializers.ModelSerializer):
     class Meta:
@@ -11,12 +13,101 @@ class StockPriceSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("A stock price entry for this symbol and timestamp already exists.")
         return value
 
+class StockPriceQuerySerializer(serializers.Serializer):
+    MAX_LIMIT = 5000
+
+    cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=MAX_LIMIT, required=False)
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    fields = serializers.CharField(required=False)
+    stream = serializers.ChoiceField(choices=['ndjson', 'csv'], required=False)
+    shape = serializers.ChoiceField(choices=['rows', 'columnar'], default='rows')
+
+    def validate_fields(self, value):
+        fields = [field.strip() for field in value.split(',') if field.strip()]
+        unknown = [field for field in fields if field not in PRICE_FIELDS]
+        if unknown or not fields:
+            raise serializers.ValidationError(f"Unknown fields: {', '.join(unknown)}. Choose from {', '.join(PRICE_FIELDS)}.")
+        return [field for field in PRICE_FIELDS if field in fields]
+
+    def validate(self, data):
+        if data.get('start') and data.get('end') and data['start'] > data['end']:
+            raise serializers.ValidationError("start must not be after end.")
+        return data
+
 class BacktestSerializer(serializers.Serializer):
     symbol = serializers.CharField(max_length=10)
     initial_investment = serializers.DecimalField(max_digits=10, decimal_places=2)
     
+class BacktestSweepSerializer(serializers.Serializer):
+    MAX_COMBINATIONS = 10000
+
+    symbols = serializers.ListField(child=serializers.CharField(max_length=10), min_length=1, max_length=100)
+    short_windows = serializers.ListField(child=serializers.IntegerField(min_value=1), min_length=1, default=[50])
+    long_windows = serializers.ListField(child=serializers.IntegerField(min_value=2), min_length=1, default=[200])
+    initial_investments = serializers.ListField(
+        child=serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0.01')), min_length=1, default=[10000]
+    )
+    sort_by = serializers.ChoiceField(
+        choices=['total_return_percentage', 'max_drawdown_percentage', 'number_of_trades', 'final_cash'],
+        default='total_return_percentage'
+    )
+    order = serializers.ChoiceField(choices=['asc', 'desc'], default='desc')
+    limit = serializers.IntegerField(min_value=1, required=False)
+
+    def validate_symbols(self, value):
+        for symbol in value:
+            if not symbol.isalpha():
+                raise serializers.ValidationError(f"Invalid stock symbol: {symbol}")
+        return list(dict.fromkeys(value))
+
+    def validate(self, data):
+        pairs = sum(1 for short in set(data['short_windows']) for long in set(data['long_windows']) if short < long)
+        if not pairs:
+            raise serializers.ValidationError("At least one short window must be smaller than a long window.")
+        combinations = len(data['symbols']) * pairs * len(data['initial_investments'])
+        if combinations > self.MAX_COMBINATIONS:
+            raise serializers.ValidationError(f"Sweep too large: {combinations} combinations (max {self.MAX_COMBINATIONS}).")
+        data['short_windows'] = sorted(set(data['short_windows']))
+        data['long_windows'] = sorted(set(data['long_windows']))
+        return data
+
+class PortfolioBacktestSerializer(serializers.Serializer):
+    symbols = serializers.ListField(child=serializers.CharField(max_length=10), min_length=1, max_length=500)
+    initial_investment = serializers.DecimalField(max_digits=14, decimal_places=2, min_value=Decimal('0.01'))
+    points = serializers.IntegerField(min_value=3, max_value=5000, default=300)
+
+    def validate_symbols(self, value):
+        for symbol in value:
+            if not symbol.isalpha():
+                raise serializers.ValidationError(f"Invalid stock symbol: {symbol}")
+        return list(dict.fromkeys(value))
+
+class IndicatorQuerySerializer(serializers.Serializer):
+    names = serializers.CharField(required=False)
+    limit = serializers.IntegerField(min_value=1, required=False)
+
+    def validate_names(self, value):
+        from app.core.indicators import INDICATOR_NAMES
+
+        names = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in names if name not in INDICATOR_NAMES]
+        if unknown or not names:
+            raise serializers.ValidationError(f"Unknown indicators: {', '.join(unknown)}. Choose from {', '.join(INDICATOR_NAMES)}.")
+        return list(dict.fromkeys(names))
+
+class BulkFetchSerializer(serializers.Serializer):
+    symbols = serializers.ListField(child=serializers.CharField(max_length=10), min_length=1, max_length=500)
+
+    def validate_symbols(self, value):
+        for symbol in value:
+            if not symbol.isalpha():
+                raise serializers.ValidationError(f"Invalid stock symbol: {symbol}")
+        return list(dict.fromkeys(value))
+
 class PredictionSerializer(serializers.ModelSerializer):
     class Meta:
         model = StockPrediction
-        fields = ['symbol', 'prediction_date', 'predicted_price']
+        fields = ['symbol', 'prediction_date', 'predicted_price', 'actual_price']
     
\ No newline at end of file
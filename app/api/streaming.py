@@ -0,0 +1,52 @@
+import csv
+from django.http import StreamingHttpResponse
+from .encoders import dumps, price_row_formatter
+
+STREAM_CHUNK_SIZE = 2000
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+class Echo:
+    """File-like object whose write() returns the line, so csv.writer can feed a generator."""
+
+    def write(self, value):
+        return value
+
+def _ndjson_lines(rows, format_row):
+    # Encoded like the JSON responses, so each line matches their rows byte for byte.
+    for row in rows:
+        yield dumps(format_row(row)) + b'\n'
+
+def _csv_lines(rows, fields, format_row):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(format_row(row).values())
+
+def _batched(lines, empty, size=STREAM_CHUNK_SIZE):
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= size:
+            yield empty.join(batch)
+            batch = []
+    if batch:
+        yield empty.join(batch)
+
+def streaming_price_response(queryset, fields, stream_format):
+    """
+    Stream every matching row as NDJSON or CSV.
+
+    Rows are pulled with a server-side cursor in chunks and written out in
+    batches, so memory stays flat however many rows match.
+    """
+    rows = queryset.order_by('symbol', 'timestamp').values_list(*fields).iterator(chunk_size=STREAM_CHUNK_SIZE)
+    format_row = price_row_formatter(fields)
+    if stream_format == 'ndjson':
+        batches = _batched(_ndjson_lines(rows, format_row), b'')
+    else:
+        batches = _batched(_csv_lines(rows, fields, format_row), '')
+    return StreamingHttpResponse(batches, content_type=CONTENT_TYPES[stream_format])
@@ -1,11 +1,20 @@
 from django.urls import path
-from .views import StockPriceListView, StockDataFetchView, BacktestView, StockPricePredictionView, GenerateStockReportView
+from .views import StockPriceListView, StockDataFetchView, StockDataRefreshView, BulkStockDataFetchView, BulkStockDataFetchStatusView, BacktestView, BacktestSweepView, PortfolioBacktestView, StockPricePredictionView, GenerateStockReportView, ReportJobStatusView, ReportJobDownloadView, IndicatorView, CacheStatsView
 
 urlpatterns = [
     path('stock-prices/', StockPriceListView.as_view(), name='stock-prices'),
+    path('stock-prices/bulk-fetch/', BulkStockDataFetchView.as_view(), name='bulk-fetch'),
+    path('stock-prices/bulk-fetch/<str:job_id>/', BulkStockDataFetchStatusView.as_view(), name='bulk-fetch-status'),
     path('stock-prices/<str:symbol>/', StockPriceListView.as_view(), name='stock-prices-symbol'),
     path('stock-prices/fetch/<str:symbol>/', StockDataFetchView.as_view(), name='fetch-stock-prices'),
+    path('stock-prices/refresh/<str:symbol>/', StockDataRefreshView.as_view(), name='refresh-stock-prices'),
     path('backtest/', BacktestView.as_view(), name='backtest'),
+    path('backtest/sweep/', BacktestSweepView.as_view(), name='backtest-sweep'),
+    path('backtest/portfolio/', PortfolioBacktestView.as_view(), name='backtest-portfolio'),
     path('prediction/<str:symbol>/', StockPricePredictionView.as_view(), name='predict-stock-prices'),
     path('report/', GenerateStockReportView.as_view(), name='generate-report'),
+    path('report/jobs/<str:job_id>/', ReportJobStatusView.as_view(), name='report-job-status'),
+    path('report/jobs/<str:job_id>/download/', ReportJobDownloadView.as_view(), name='report-job-download'),
+    path('indicators/<str:symbol>/', IndicatorView.as_view(), name='indicators'),
+    path('cache/stats/', CacheStatsView.as_view(), name='cache-stats'),
 ]
@@ -1,49 +1,117 @@
 import logging
+from datetime import datetime, time, timedelta, timezone as dt_timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from django.http import FileResponse
+from io import BytesIO
+from django.http import FileResponse, HttpResponse
+from django.urls import reverse
 from rest_framework import status
-from .serializers import StockPriceSerializer, BacktestSerializer, PredictionSerializer
-from app.core.models import StockPrice, StockPrediction, StockReport
-from app.core.services import fetch_stock_data, backtest_strategy, predict_stock_prices
-from app.core.utils import fetch_stock_data_from_api, fetch_stock_prediction_from_api, fetch_backtest_data_from_api
-from app.reports.report_generator import generate_report
-from django.core.cache import cache
-import pandas as pd
+from .serializers import StockPriceQuerySerializer, BacktestSerializer, BacktestSweepSerializer, PortfolioBacktestSerializer, BulkFetchSerializer, IndicatorQuerySerializer, PredictionSerializer
+from app.core.models import StockPrice
+from .encoders import PRICE_FIELDS, price_row_formatter, price_columns, dumps
+from .pagination import keyset_page, InvalidCursor
+from .streaming import streaming_price_response
+from app.reports.pipeline import get_cached_report
+from app.reports.jobs import enqueue_report_job, get_job, get_job_artifact, QUEUED, FINISHED
+from app.core.caching import cached_compute, versioned_key, cache_stats
 
 logger = logging.getLogger(__name__)
 
+# The service layer brings in pandas, NumPy and httpx, so views import it in the
+# handlers that use it: listing prices, job status and cache stats boot without it.
+
+DEFAULT_PAGE_SIZE = 500
+
+def encode_prices(rows, fields, shape='rows'):
+    if shape == 'columnar':
+        return price_columns(rows, fields)
+    format_row = price_row_formatter(fields)
+    return [format_row(row) for row in rows]
+
+def json_response(data, status_code=status.HTTP_200_OK):
+    """Serve already-encodable data through the fast JSON backend, bypassing the DRF renderer."""
+    return HttpResponse(dumps(data), status=status_code, content_type='application/json')
+
 class StockPriceListView(APIView):
     """
     Retrieve stock prices.
 
-    GET /api/v1/stock-prices/ - Retrieve all stock prices.
+    GET /api/v1/stock-prices/ - Retrieve all stock prices, one page at a time.
     GET /api/v1/stock-prices/<symbol>/ - Retrieve stock prices for a specific symbol.
+
+    Query Parameters:
+        cursor   # Opaque cursor from a previous page's "next_cursor"
+        limit    # Page size, 1-5000 (default 500); paginates the symbol listing too
+        start    # First date to include, YYYY-MM-DD
+        end      # Last date to include, YYYY-MM-DD
+        fields   # Comma-separated projection, e.g. "timestamp,close"
+        stream   # "ndjson" or "csv" to stream every matching row instead of paginating
+        shape    # "rows" (default) or "columnar" for {"timestamp": [...], "close": [...]}
+
+    Paginated responses:
+    {
+        "results": [...],
+        "next_cursor": str or null,
+        "next": url or null
+    }
     """
 
     def get(self, request, symbol=None):
-        if symbol:
-            
-            if not symbol.isalpha() or len(symbol) > 10:
-                return Response({"error": "Invalid stock symbol."}, status=status.HTTP_400_BAD_REQUEST)
-            
-            cache_key = f"stock_prices_{symbol}"
-            cached_data = cache.get(cache_key)
-            if cached_data:
-                logger.info(f"Retrieved cached data for: {symbol}")
-                return Response(cached_data, status=status.HTTP_200_OK)
-
-            stock_prices = StockPrice.objects.filter(symbol=symbol)
-            if not stock_prices.exists():
-                logger.info(f"No stock prices found for symbol: {symbol}")
-                return Response({"error": "No stock prices found for this symbol."}, status=status.HTTP_404_NOT_FOUND)
-        else:
-            stock_prices = StockPrice.objects.all()
-
-        serializer = StockPriceSerializer(stock_prices, many=True)
-        cache.set(cache_key, serializer.data, timeout=60 * 60)
-        logger.info(f"Retrieved {len(serializer.data)} stock prices (symbol: {symbol})")
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        if symbol is not None and (not symbol.isalpha() or len(symbol) > 10):
+            return Response({"error": "Invalid stock symbol."}, status=status.HTTP_400_BAD_REQUEST)
+
+        query = StockPriceQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = query.validated_data
+        fields = params.get('fields', PRICE_FIELDS)
+
+        stock_prices = StockPrice.objects.filter(symbol=symbol) if symbol else StockPrice.objects.all()
+        if params.get('start'):
+            stock_prices = stock_prices.filter(timestamp__gte=datetime.combine(params['start'], time.min, tzinfo=dt_timezone.utc))
+        if params.get('end'):
+            stock_prices = stock_prices.filter(timestamp__lt=datetime.combine(params['end'] + timedelta(days=1), time.min, tzinfo=dt_timezone.utc))
+
+        if params.get('stream'):
+            logger.info(f"Streaming stock prices as {params['stream']} (symbol: {symbol})")
+            return streaming_price_response(stock_prices, fields, params['stream'])
+
+        if symbol is None or 'cursor' in params or 'limit' in params:
+            try:
+                rows, next_cursor = keyset_page(stock_prices, fields, params.get('cursor'), params.get('limit', DEFAULT_PAGE_SIZE))
+            except InvalidCursor as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            next_url = None
+            if next_cursor:
+                next_query = request.query_params.copy()
+                next_query['cursor'] = next_cursor
+                next_url = request.build_absolute_uri(f"{request.path}?{next_query.urlencode()}")
+
+            logger.info(f"Retrieved a page of {len(rows)} stock prices (symbol: {symbol})")
+            return json_response({
+                "results": encode_prices(rows, fields, params['shape']),
+                "next_cursor": next_cursor,
+                "next": next_url,
+            })
+
+        if set(params) & {'start', 'end', 'fields'} or params['shape'] != 'rows':
+            rows = list(stock_prices.order_by('timestamp').values_list(*fields))
+            logger.info(f"Retrieved {len(rows)} filtered stock prices (symbol: {symbol})")
+            return json_response(encode_prices(rows, fields, params['shape']))
+
+        def encode_symbol_prices():
+            rows = list(stock_prices.values_list(*PRICE_FIELDS))
+            logger.info(f"Retrieved {len(rows)} stock prices (symbol: {symbol})")
+            return dumps(encode_prices(rows, PRICE_FIELDS)) if rows else None
+
+        content = cached_compute(
+            versioned_key('stock_prices', symbol), encode_symbol_prices, stats_name=f"stock_prices:{symbol}"
+        )
+        if content is None:
+            logger.info(f"No stock prices found for symbol: {symbol}")
+            return Response({"error": "No stock prices found for this symbol."}, status=status.HTTP_404_NOT_FOUND)
+        return HttpResponse(content, content_type='application/json')
 
 class StockDataFetchView(APIView):
     """
@@ -53,6 +121,8 @@ class StockDataFetchView(APIView):
     """
 
     def post(self, request, symbol):
+        from app.core.services import fetch_stock_data
+
         if not symbol.isalpha() or len(symbol) > 10:
             return Response({"error": "Invalid stock symbol."}, status=status.HTTP_400_BAD_REQUEST)
         
@@ -62,12 +132,108 @@ class StockDataFetchView(APIView):
             return Response({"message": f"Stock data for {symbol} already exists."}, status=status.HTTP_200_OK)
 
         try:
-            fetch_stock_data(symbol)
+            result = fetch_stock_data(symbol)
             logger.info(f"Successfully fetched and stored stock data for symbol: {symbol}")
-            return Response({"message": f"Stock data for {symbol} has been fetched and stored."}, status=status.HTTP_201_CREATED)
+            return Response({"message": f"Stock data for {symbol} has been fetched and stored.", "ingestion": result}, status=status.HTTP_201_CREATED)
         except Exception as e:
             logger.error(f"Error fetching stock data for {symbol}: {str(e)}")
             return Response({"error": "Failed to fetch stock data."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class StockDataRefreshView(APIView):
+    """
+    Append the latest bars for a symbol.
+
+    POST /api/v1/stock-prices/refresh/<symbol>/ - Download only the bars newer than the latest stored one.
+    """
+
+    def post(self, request, symbol):
+        from app.core.services import refresh_stock_data
+        from app.core.ingestion import SymbolNotFound, RateLimited
+
+        if not symbol.isalpha() or len(symbol) > 10:
+            return Response({"error": "Invalid stock symbol."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            result = refresh_stock_data(symbol)
+            logger.info(f"Refreshed stock data for {symbol}: {result['inserted']} new bars")
+            return Response({"message": f"Stock data for {symbol} has been refreshed.", "ingestion": result}, status=status.HTTP_200_OK)
+        except SymbolNotFound:
+            logger.error(f"Alpha Vantage does not know symbol {symbol}")
+            return Response({"error": "Unknown stock symbol."}, status=status.HTTP_404_NOT_FOUND)
+        except RateLimited as e:
+            logger.error(f"Alpha Vantage quota reached while refreshing {symbol}: {str(e)}")
+            return Response({"error": "Alpha Vantage rate limit reached, try again later."}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        except Exception as e:
+            logger.error(f"Error refreshing stock data for {symbol}: {str(e)}")
+            return Response({"error": "Failed to refresh stock data."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class BulkStockDataFetchView(APIView):
+    """
+    Fetch or refresh many symbols in the background, within the Alpha Vantage quota.
+
+    POST /api/v1/stock-prices/bulk-fetch/
+
+    Request body:
+    {
+        "symbols": ["AAPL", "MSFT"]     # Up to 500 symbols
+    }
+
+    Returns 202 with the job id and a status URL to poll.
+    """
+
+    def post(self, request):
+        from app.core.bulk_ingestion import start_ingestion_job
+
+        serializer = BulkFetchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        symbols = serializer.validated_data['symbols']
+        try:
+            job_id = start_ingestion_job(symbols)
+        except Exception as e:
+            logger.error(f"Error starting bulk ingestion: {str(e)}")
+            return Response({"error": "Failed to start bulk ingestion."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        return Response({
+            "job_id": job_id,
+            "status": "running",
+            "status_url": reverse('bulk-fetch-status', args=[job_id]),
+        }, status=status.HTTP_202_ACCEPTED)
+
+class BulkStockDataFetchStatusView(APIView):
+    """
+    Poll the progress of a bulk fetch.
+
+    GET /api/v1/stock-prices/bulk-fetch/<job_id>/
+
+    Returns:
+    {
+        "job_id": str,
+        "status": "running" | "finished" | "failed",
+        "symbols": [str],
+        "total": int,
+        "completed": int,
+        "succeeded": int,
+        "failed": int,
+        "created_at": str,
+        "finished_at": str,             # Once finished
+        "elapsed_seconds": float,       # Once finished
+        "results": [object]             # Once finished, one entry per symbol
+    }
+    """
+
+    def get(self, request, job_id):
+        from app.core.bulk_ingestion import get_ingestion_job
+
+        try:
+            job = get_ingestion_job(job_id)
+        except Exception as e:
+            logger.error(f"Error reading bulk ingestion job {job_id}: {str(e)}")
+            return Response({"error": "Failed to read bulk fetch job."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        if job is None:
+            return Response({"error": "Bulk fetch job not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(job, status=status.HTTP_200_OK)
         
 class BacktestView(APIView):
     """
@@ -91,19 +257,18 @@ class BacktestView(APIView):
     """
 
     def post(self, request):
+        from app.core.services import backtest_strategy, load_price_frame, BACKTEST_INDICATORS
+
         serializer = BacktestSerializer(data=request.data)
         if serializer.is_valid():
             symbol = serializer.validated_data['symbol']
             initial_investment = serializer.validated_data['initial_investment']
             logger.info(f"Starting backtest for symbol: {symbol}.")
 
-            stock_data = StockPrice.objects.filter(symbol=symbol).order_by('timestamp')
-            if not stock_data.exists():
+            df = load_price_frame(symbol, indicators=BACKTEST_INDICATORS)
+            if df is None:
                 return Response({'error': 'Stock data not found'}, status=status.HTTP_404_NOT_FOUND)
 
-            df = pd.DataFrame(list(stock_data.values('timestamp', 'close')))
-            df.set_index('timestamp', inplace=True)
-
             results = backtest_strategy(df, initial_investment)
 
             logger.info(f"Backtest completed for symbol: {symbol}.")
@@ -112,12 +277,145 @@ class BacktestView(APIView):
         logger.error(f"Invalid data provided for backtesting: {serializer.errors}")
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
+class BacktestSweepView(APIView):
+    """
+    Parameter-sweep Backtesting Endpoint.
+
+    POST /api/v1/backtest/sweep/ - Run the crossover backtest over a grid of parameters.
+
+    Request Body:
+    {
+        "symbols": ["AAPL", "MSFT"],            # Stock symbols to backtest
+        "short_windows": [20, 50],              # Short moving-average windows
+        "long_windows": [100, 200],             # Long moving-average windows
+        "initial_investments": [10000.00],      # Initial investment amounts
+        "sort_by": "total_return_percentage",   # Metric used for ranking
+        "order": "desc",                        # Ranking order
+        "limit": 10                             # Optional number of rows to return
+    }
+
+    Returns:
+    {
+        "combinations": int,                    # Number of combinations evaluated
+        "missing_symbols": [str],               # Symbols without stored prices
+        "results": [
+            {"rank": int, "symbol": str, "short_window": int, "long_window": int,
+             "initial_investment": float, "total_return_percentage": float,
+             "max_drawdown_percentage": float, "number_of_trades": int, "final_cash": float},
+            ...
+        ]
+    }
+    """
+
+    def post(self, request):
+        from app.core.sweep import load_close_series, run_sweep
+
+        serializer = BacktestSweepSerializer(data=request.data)
+        if not serializer.is_valid():
+            logger.error(f"Invalid data provided for backtest sweep: {serializer.errors}")
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        params = serializer.validated_data
+        series = load_close_series(params['symbols'])
+        missing_symbols = [symbol for symbol in params['symbols'] if symbol not in series]
+        if not series:
+            return Response({'error': 'Stock data not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        logger.info(f"Starting backtest sweep for symbols: {', '.join(series)}.")
+        results = run_sweep(
+            series,
+            params['short_windows'],
+            params['long_windows'],
+            params['initial_investments'],
+            sort_by=params['sort_by'],
+            descending=params['order'] == 'desc',
+        )
+
+        logger.info(f"Backtest sweep completed with {len(results)} combinations.")
+        return Response({
+            'combinations': len(results),
+            'missing_symbols': missing_symbols,
+            'results': results[:params.get('limit')],
+        }, status=status.HTTP_200_OK)
+
+class PortfolioBacktestView(APIView):
+    """
+    Portfolio Backtesting Endpoint.
+
+    POST /api/v1/backtest/portfolio/ - Backtest the crossover strategy on many symbols as one portfolio.
+
+    Request Body:
+    {
+        "symbols": ["AAPL", "MSFT"],    # Stock symbols, up to 500
+        "initial_investment": 10000.00, # Split equally between the symbols
+        "points": 300                   # Optional size of the returned equity curve
+    }
+
+    Returns:
+    {
+        "start": str, "end": str,       # Dates covered
+        "missing_symbols": [str],       # Symbols without stored prices
+        "total_return_percentage": float,
+        "max_drawdown_percentage": float,
+        "number_of_trades": int,
+        "final_value": float,           # Cash plus open positions at the last close
+        "open_positions": int,
+        "symbols": [{"symbol": str, "number_of_trades": int, "final_value": float}, ...],
+        "equity_curve": {"timestamp": [str], "equity": [float]}
+    }
+    """
+
+    def post(self, request):
+        import numpy as np
+        import pandas as pd
+        from app.core.portfolio import load_portfolio, run_portfolio_backtest
+        from app.core.backtesting import BACKTEST_INDICATORS
+        from app.reports.summary import lttb
+
+        serializer = PortfolioBacktestSerializer(data=request.data)
+        if not serializer.is_valid():
+            logger.error(f"Invalid data provided for portfolio backtest: {serializer.errors}")
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        params = serializer.validated_data
+        portfolio = load_portfolio(params['symbols'])
+        if portfolio is None:
+            return Response({'error': 'Stock data not found'}, status=status.HTTP_404_NOT_FOUND)
+        timestamps, symbols, matrices = portfolio
+
+        logger.info(f"Starting portfolio backtest for {len(symbols)} symbols over {len(timestamps)} dates.")
+        ma_short, ma_long = (matrices[name] for name in BACKTEST_INDICATORS)
+        result = run_portfolio_backtest(matrices['close'], params['initial_investment'], ma_short=ma_short, ma_long=ma_long)
+
+        sampled = lttb(timestamps, result['equity'], params['points'])
+        dates = pd.to_datetime(timestamps[sampled], utc=True)
+        data = {
+            'start': dates[0].strftime('%Y-%m-%d'),
+            'end': dates[-1].strftime('%Y-%m-%d'),
+            'missing_symbols': [symbol for symbol in params['symbols'] if symbol not in symbols],
+            **{key: result[key] for key in ('total_return_percentage', 'max_drawdown_percentage',
+                                            'number_of_trades', 'final_value', 'open_positions')},
+            'symbols': [
+                {'symbol': symbol, 'number_of_trades': int(trades), 'final_value': round(float(value), 2)}
+                for symbol, trades, value in zip(symbols, result['symbol_trades'], result['symbol_values'])
+            ],
+            'equity_curve': {
+                'timestamp': [date.strftime('%Y-%m-%d') for date in dates],
+                'equity': np.round(result['equity'][sampled], 2).tolist(),
+            },
+        }
+        logger.info(f"Portfolio backtest completed with {result['number_of_trades']} trades.")
+        return json_response(data)
+
 class StockPricePredictionView(APIView):
     """
     Predict future stock prices.
 
     POST /api/v1/prediction/<symbol>/ # Stock symbol to predict prices for
 
+    Serves the forecast stored by the daily prediction batch; symbols the batch
+    has not covered yet are forecast on demand.
+
     Returns:
     {
         "predictions": [
@@ -128,48 +426,43 @@ class StockPricePredictionView(APIView):
     """
 
     def post(self, request, symbol):
+        from app.core.services import load_price_frame, precomputed_predictions, predict_stock_prices, store_predictions
+        from app.core.model_registry import registry
+
         if not symbol or not symbol.isalpha() or len(symbol) > 10:
             return Response({"error": "Invalid stock symbol."}, status=status.HTTP_400_BAD_REQUEST)
-        
-        cache_key = f"prediction_{symbol}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            logger.info(f"Retrieved cached prediction for: {symbol}")
-            return Response(cached_data, status=status.HTTP_200_OK)
-        
-        stock_data = StockPrice.objects.filter(symbol=symbol).order_by('timestamp')
-        if not stock_data.exists():
-            return Response({"error": "No historical data found for this symbol."}, status=status.HTTP_404_NOT_FOUND)
 
-        df = pd.DataFrame(list(stock_data.values('timestamp', 'close')))
-        df.set_index('timestamp', inplace=True)
+        # Forecasts of a replaced model are neither read from the table nor from the cache.
+        revision = registry.revision_for(symbol)
 
-        try:
-            predictions = predict_stock_prices(df)
+        def compute_predictions():
+            precomputed = precomputed_predictions(symbol, revision=revision)
+            if precomputed is not None:
+                return PredictionSerializer(precomputed, many=True).data
+
+            df = load_price_frame(symbol)
+            if df is None:
+                return None
+
+            predictions = predict_stock_prices(df, symbol=symbol)
             logger.info(f"Predictions generated for symbol: {symbol}")
-            
-            for _, row in predictions.iterrows():
-                prediction_date = row['date'].date()
-                predicted_price = row['predicted_price']
-
-                StockPrediction.objects.update_or_create(
-                    symbol=symbol,
-                    prediction_date=prediction_date,
-                    defaults={
-                        'predicted_price': predicted_price
-                    }
-                )
 
+            latest_predictions = store_predictions(symbol, predictions)
             logger.info(f"Predictions for {symbol} stored/updated in the database")
-            latest_predictions = StockPrediction.objects.filter(symbol=symbol).order_by('prediction_date')
-            prediction_serializer = PredictionSerializer(latest_predictions, many=True)
-            cache.set(cache_key, prediction_serializer.data, timeout=60 * 60)
-            return Response({"predictions": prediction_serializer.data}, status=status.HTTP_200_OK)
+            return PredictionSerializer(latest_predictions, many=True).data
 
+        try:
+            prediction_data = cached_compute(
+                versioned_key('prediction', symbol, revision), compute_predictions, stats_name=f"prediction:{symbol}"
+            )
         except Exception as e:
             logger.error(f"Error occurred during prediction for {symbol}: {str(e)}")
             return Response({"error": "Prediction failed."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+        if prediction_data is None:
+            return Response({"error": "No historical data found for this symbol."}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"predictions": prediction_data}, status=status.HTTP_200_OK)
+
 class GenerateStockReportView(APIView):
     """
     Generate a report for a stock symbol.
@@ -184,8 +477,14 @@ class GenerateStockReportView(APIView):
     }
 
     Returns:
-    - JSON response with the report data if 'json' is selected.
-    - PDF file if 'pdf' is selected.
+    - The cached JSON report or PDF file if an identical report was generated recently.
+    - Otherwise 202 with the id of a queued report job (identical in-flight requests share one job):
+    {
+        "job_id": str,
+        "status": "queued" | "running" | "finished" | "failed",
+        "status_url": "/api/v1/report/jobs/<job_id>/",
+        "download_url": "/api/v1/report/jobs/<job_id>/download/"
+    }
     """
 
     def post(self, request):
@@ -193,53 +492,151 @@ class GenerateStockReportView(APIView):
         report_format = request.data.get('format', 'json').lower()
         initial_investment = request.data.get("initial_investment", 10000)
 
-        if not symbol.isalpha() or len(symbol) > 10:
+        if not symbol or not symbol.isalpha() or len(symbol) > 10:
             logger.warning(f"Invalid stock symbol: {symbol}")
             return Response({"error": "Invalid stock symbol."}, status=status.HTTP_400_BAD_REQUEST)
-        
-        cache_key = f'report_{symbol}_{initial_investment}_{report_format}'
-        cached_data = cache.get(cache_key)
-        
+
+        if report_format not in ('json', 'pdf'):
+            return Response({"error": "Invalid report format."}, status=status.HTTP_400_BAD_REQUEST)
+
+        cached_data = get_cached_report(symbol, initial_investment, report_format)
         if cached_data:
             if report_format == 'pdf':
                 logger.info(f"PDF report fetched from cache for symbol: {symbol}")
-                return FileResponse(cached_data, as_attachment=True, filename=f"{symbol}_report.pdf")
+                return FileResponse(BytesIO(cached_data), as_attachment=True, filename=f"{symbol}_report.pdf")
             logger.info(f"json report fetched from cache for symbol: {symbol}")
             return Response(cached_data, status=status.HTTP_200_OK)
 
         try:
-            stock_data = fetch_stock_data_from_api(symbol)
-            stock_prediction = fetch_stock_prediction_from_api(symbol)
-            backtest_data = fetch_backtest_data_from_api(symbol, initial_investment)
-
-            if not stock_data or not stock_prediction:
-                logger.warning(f"Missing data for symbol: {symbol}")
-                return Response({"error": "Stock data or predictions not found."}, status=status.HTTP_404_NOT_FOUND)
-            
-            report_data, html_report, pdf_output = generate_report(
-                symbol=symbol,
-                historical_data=stock_data,
-                predictions=stock_prediction,
-                backtest_data=backtest_data
-            )
+            job_id, created = enqueue_report_job(symbol, report_format, initial_investment)
+        except Exception as e:
+            logger.error(f"Error queueing report for {symbol}: {str(e)}")
+            return Response({"error": "Failed to queue report."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        job = get_job(job_id) or {'status': QUEUED}
+        return Response({
+            "job_id": job_id,
+            "status": job['status'],
+            "status_url": reverse('report-job-status', args=[job_id]),
+            "download_url": reverse('report-job-download', args=[job_id]),
+        }, status=status.HTTP_202_ACCEPTED)
+
+class ReportJobStatusView(APIView):
+    """
+    Poll the status of a report job.
 
-            report, created = StockReport.objects.update_or_create(
-                symbol=symbol,
-                defaults={'report_data': report_data}
-            )
-            logger.info(f"Report for {symbol} {'created' if created else 'updated'} in the database")
+    GET /api/v1/report/jobs/<job_id>/
 
-            cache.set(cache_key, report_data if report_format == 'json' else pdf_output, timeout=60 * 60)
-            
-            if report_format == 'pdf':
-                logger.info(f"PDF report generated for symbol: {symbol}")
-                return FileResponse(pdf_output, as_attachment=True, filename=f"{symbol}_report.pdf")
+    Returns:
+    {
+        "job_id": str,
+        "status": "queued" | "running" | "finished" | "failed",
+        "symbol": str,
+        "format": "json" | "pdf",
+        "created_at": str,
+        "started_at": str,              # Once running
+        "finished_at": str,             # Once finished or failed
+        "error": str,                   # Only when failed
+        "download_url": str             # Only when finished
+    }
+    """
 
-            logger.info(f"JSON report generated for symbol: {symbol}")
-            return Response(report_data, status=status.HTTP_200_OK)
+    def get(self, request, job_id):
+        job = get_job(job_id)
+        if job is None:
+            return Response({"error": "Report job not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        except Exception as e:
-            logger.error(f"Error generating report for {symbol}: {str(e)}")
-            return Response({"error": "Failed to generate report."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        job.pop('fingerprint', None)
+        job.pop('report_key', None)
+        if job['status'] == FINISHED:
+            job['download_url'] = reverse('report-job-download', args=[job_id])
+        return Response(job, status=status.HTTP_200_OK)
+
+class ReportJobDownloadView(APIView):
+    """
+    Download the output of a finished report job.
+
+    GET /api/v1/report/jobs/<job_id>/download/ - JSON report or PDF file, depending on the job format.
+    """
+
+    def get(self, request, job_id):
+        job = get_job(job_id)
+        if job is None:
+            return Response({"error": "Report job not found."}, status=status.HTTP_404_NOT_FOUND)
+        if job['status'] != FINISHED:
+            return Response({"error": f"Report job is {job['status']}."}, status=status.HTTP_409_CONFLICT)
+
+        artifact = get_job_artifact(job)
+        if artifact is None:
+            return Response({"error": "Report output has expired."}, status=status.HTTP_410_GONE)
 
-    
\ No newline at end of file
+        if job['format'] == 'pdf':
+            return FileResponse(BytesIO(artifact), as_attachment=True, filename=f"{job['symbol']}_report.pdf")
+        return Response(artifact, status=status.HTTP_200_OK)
+
+class IndicatorView(APIView):
+    """
+    Precomputed technical indicators for a symbol.
+
+    GET /api/v1/indicators/<symbol>/?names=sma_50,rsi_14&limit=250
+
+    Query parameters:
+        names   Comma-separated indicators (default: all of sma_30, sma_50, sma_200,
+                ema_12, ema_26, rsi_14, bollinger_middle, bollinger_upper,
+                bollinger_lower, vwap_20)
+        limit   Only the most recent N bars
+
+    Returns columns aligned by index; values are null until an indicator's window is full:
+    {
+        "symbol": str,
+        "timestamp": [str],
+        "<indicator>": [float | null]
+    }
+    """
+
+    def get(self, request, symbol):
+        import numpy as np
+        import pandas as pd
+        from app.core.indicators import INDICATOR_NAMES
+        from app.core.series_store import get_series
+
+        if not symbol.isalpha() or len(symbol) > 10:
+            return Response({"error": "Invalid stock symbol."}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = IndicatorQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        names = serializer.validated_data.get('names', INDICATOR_NAMES)
+        limit = serializer.validated_data.get('limit')
+
+        series = get_series(symbol, columns=('timestamp', *names))
+        if series is None:
+            return Response({"error": "No stock prices found for this symbol."}, status=status.HTTP_404_NOT_FOUND)
+
+        window = slice(-limit, None) if limit else slice(None)
+        timestamps = pd.to_datetime(series['timestamp'][window], utc=True)
+        data = {"symbol": symbol, "timestamp": [timestamp.strftime('%Y-%m-%dT%H:%M:%SZ') for timestamp in timestamps]}
+        for name in names:
+            values = series[name][window]
+            data[name] = np.where(np.isnan(values), None, np.round(values, 4)).tolist()
+        return json_response(data)
+
+class CacheStatsView(APIView):
+    """
+    Cache statistics.
+
+    GET /api/v1/cache/stats/ - Hit, miss and early-refresh counters per cached key.
+
+    Returns:
+    {
+        "prediction:AAPL": {"hits": int, "misses": int, "early_refreshes": int},
+        ...
+    }
+    """
+
+    def get(self, request):
+        try:
+            return Response(cache_stats(), status=status.HTTP_200_OK)
+        except Exception as e:
+            logger.error(f"Error reading cache statistics: {str(e)}")
+            return Response({"error": "Cache statistics unavailable."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
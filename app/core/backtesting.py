@@ -0,0 +1,116 @@
+import numpy as np
+from decimal import Decimal
+from .indicators import sma
+
+SHORT_WINDOW = 50
+LONG_WINDOW = 200
+# Series store columns holding the short and long crossover averages.
+BACKTEST_INDICATORS = (f'sma_{SHORT_WINDOW}', f'sma_{LONG_WINDOW}')
+
+def crossover_trades(close, ma_short, ma_long):
+    """
+    Resolve the all-in/all-out crossover state machine over float64 arrays.
+
+    A buy fires on the first bar where close < ma_short while flat, a sell on the
+    first later bar where close > ma_long while long. Only the bars that change
+    state are visited, so the cost is one vectorized pass plus O(trades log n).
+    Returns the buy and sell bar indices; a trailing open position has one more
+    buy than sell.
+    """
+    valid = ~(np.isnan(close) | np.isnan(ma_short) | np.isnan(ma_long))
+    buy_candidates = np.flatnonzero(valid & (close < ma_short))
+    sell_candidates = np.flatnonzero(valid & (close > ma_long))
+
+    buys, sells = [], []
+    position = 0
+    while True:
+        i = np.searchsorted(buy_candidates, position)
+        if i == len(buy_candidates):
+            break
+        buy = buy_candidates[i]
+        buys.append(buy)
+
+        j = np.searchsorted(sell_candidates, buy + 1)
+        if j == len(sell_candidates):
+            break
+        sell = sell_candidates[j]
+        sells.append(sell)
+        position = sell + 1
+
+    return np.asarray(buys, dtype=np.intp), np.asarray(sells, dtype=np.intp)
+
+def simulate_trades(buy_prices, sell_prices, initial_investment):
+    """Apply round trips to the starting cash, matching the semantics of the original loop."""
+    cash = initial_investment
+    total_return = 0
+    max_drawdown = 0
+    max_value = initial_investment
+
+    for i, buy_price in enumerate(buy_prices):
+        shares = cash / buy_price
+        cash = 0
+        if i == len(sell_prices):
+            break
+
+        cash = shares * sell_prices[i]
+        total_return = (cash - initial_investment) / initial_investment * 100
+        max_value = max(max_value, cash)
+        drawdown = (max_value - cash) / max_value * 100
+        max_drawdown = max(max_drawdown, drawdown)
+
+    return {
+        'total_return_percentage': round(total_return, 2),
+        'max_drawdown_percentage': round(max_drawdown, 2),
+        'number_of_trades': len(buy_prices) + len(sell_prices),
+        'final_cash': round(cash, 2)
+    }
+
+def run_backtest(close, initial_investment, short_window=SHORT_WINDOW, long_window=LONG_WINDOW, ma_short=None, ma_long=None):
+    """
+    Backtest the moving-average crossover strategy on a close price array.
+
+    Signals are computed on a contiguous float64 copy; the round-trip arithmetic
+    only touches the traded bars and keeps the scalar type of the input (e.g.
+    Decimal values from the ORM) so results are identical to the row loop.
+    With a Decimal investment and float64 prices, the traded bars are turned
+    back into the Decimal values they were stored as. Precomputed averages
+    (e.g. from the series store) can be passed as ma_short/ma_long.
+    """
+    close = np.asarray(close)
+    values = close.astype(np.float64)
+    buys, sells = crossover_trades(
+        values,
+        sma(values, short_window) if ma_short is None else np.asarray(ma_short, dtype=np.float64),
+        sma(values, long_window) if ma_long is None else np.asarray(ma_long, dtype=np.float64),
+    )
+    buy_prices, sell_prices = close[buys], close[sells]
+    if isinstance(initial_investment, Decimal) and close.dtype.kind == 'f':
+        buy_prices = [Decimal(repr(float(price))) for price in buy_prices]
+        sell_prices = [Decimal(repr(float(price))) for price in sell_prices]
+    return simulate_trades(buy_prices, sell_prices, initial_investment)
+
+def sweep_close_series(close, short_windows, long_windows, initial_investments):
+    """
+    Evaluate every (short, long, investment) combination against one close series.
+
+    Each distinct window is averaged once and each window pair's trades are
+    resolved once; the investments only rescale the handful of traded bars.
+    """
+    values = np.asarray(close, dtype=np.float64)
+    averages = {window: sma(values, window) for window in set(short_windows) | set(long_windows)}
+
+    results = []
+    for short_window in short_windows:
+        for long_window in long_windows:
+            if short_window >= long_window:
+                continue
+            buys, sells = crossover_trades(values, averages[short_window], averages[long_window])
+            buy_prices, sell_prices = values[buys], values[sells]
+            for initial_investment in initial_investments:
+                results.append({
+                    'short_window': short_window,
+                    'long_window': long_window,
+                    'initial_investment': initial_investment,
+                    **simulate_trades(buy_prices, sell_prices, initial_investment),
+                })
+    return results
@@ -0,0 +1,250 @@
+import json
+import time
+import uuid
+import random
+import asyncio
+import logging
+import threading
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+from django_redis import get_redis_connection
+from .ingestion import DailySeriesParser, RateLimited
+from .services import refresh_plan, ingest_price_frame
+from .prediction_batch import run_prediction_batch
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRIES = 4
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 60.0
+REQUEST_TIMEOUT = 30.0
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+JOB_KEY = 'ingestion_jobs:job:{}'
+JOB_TTL = 24 * 60 * 60
+
+RUNNING = 'running'
+FINISHED = 'finished'
+FAILED = 'failed'
+
+class TokenBucket:
+    """
+    Asyncio token bucket: `rate` tokens per second, holding at most `capacity`.
+
+    The bucket starts full. Waiters are served one at a time in arrival order.
+    `clock` and `sleep` can be replaced, e.g. by a fake clock.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=asyncio.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                # A microsecond of slack: waiting exactly can leave a floating-point hair below one token.
+                await self.sleep((1 - self.tokens) / self.rate + 1e-6)
+
+def quota_bucket(requests_per_minute, **options):
+    """
+    The bucket that keeps requests within a per-minute quota.
+
+    Its capacity is a single token: a larger burst on top of the refill rate
+    would let the first minute send capacity + requests_per_minute calls.
+    """
+    return TokenBucket(requests_per_minute / 60, capacity=1, **options)
+
+def backoff_delay(attempt):
+    """Exponential backoff with full jitter, in seconds."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+class BulkIngester:
+    """
+    Bring many symbols up to date concurrently over one pooled HTTP/2 connection.
+
+    Every request, retries included, takes a token from a bucket refilled at
+    ALPHA_VANTAGE_REQUESTS_PER_MINUTE, so the API key's quota is never exceeded
+    however many symbols are queued. Transport errors, 429/5xx responses and
+    Alpha Vantage's quota notices are retried with exponential backoff.
+
+    The HTTP layer is pluggable: pass any httpx.AsyncClient, e.g. one built with
+    httpx.MockTransport or pointed at a local fake server through base_url.
+    `on_progress` is called with a progress dict after each symbol.
+    """
+
+    def __init__(self, client=None, requests_per_minute=None, concurrency=None, max_retries=MAX_RETRIES,
+                 on_progress=None):
+        self.client = client
+        self.requests_per_minute = requests_per_minute or settings.ALPHA_VANTAGE_REQUESTS_PER_MINUTE
+        self.concurrency = concurrency or settings.INGESTION_CONCURRENCY
+        self.max_retries = max_retries
+        self.on_progress = on_progress
+
+    def _default_client(self):
+        return httpx.AsyncClient(
+            base_url=settings.ALPHA_VANTAGE_BASE_URL,
+            http2=True,
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+        )
+
+    async def fetch_series(self, client, bucket, symbol, outputsize, since):
+        """Stream one symbol's bars on or after `since` into a typed frame, retrying transient failures."""
+        params = {
+            'function': 'TIME_SERIES_DAILY',
+            'symbol': symbol,
+            'apikey': settings.ALPHA_VANTAGE_API_KEY,
+            'outputsize': outputsize,
+        }
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire()
+            try:
+                parser = DailySeriesParser(since)
+                async with client.stream('GET', '/query', params=params) as response:
+                    if response.is_error:
+                        await response.aread()
+                        raise httpx.HTTPStatusError(f"HTTP {response.status_code}", request=response.request, response=response)
+                    async for chunk in response.aiter_bytes():
+                        if parser.feed(chunk):
+                            break
+                parser.check()
+                return parser.frame()
+            except (httpx.TransportError, httpx.HTTPStatusError, RateLimited) as e:
+                retryable = not isinstance(e, httpx.HTTPStatusError) or e.response.status_code in RETRY_STATUS_CODES
+                if not retryable or attempt == self.max_retries:
+                    raise
+                delay = backoff_delay(attempt)
+                logger.warning(f"Fetching {symbol} failed ({str(e) or type(e).__name__}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def ingest_symbol(self, client, bucket, semaphore, symbol):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                outputsize, since, high_water_mark = await sync_to_async(refresh_plan)(symbol)
+                frame = await self.fetch_series(client, bucket, symbol, outputsize, since)
+                result = await sync_to_async(ingest_price_frame)(symbol, frame, outputsize, high_water_mark)
+                return {**result, 'status': 'succeeded'}
+            except Exception as e:
+                logger.error(f"Bulk ingestion failed for {symbol}: {str(e)}")
+                return {
+                    'symbol': symbol,
+                    'status': 'failed',
+                    'error': str(e) or type(e).__name__,
+                    'elapsed_seconds': round(time.perf_counter() - started, 4),
+                }
+
+    async def run(self, symbols):
+        started = time.perf_counter()
+        bucket = quota_bucket(self.requests_per_minute)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        progress = {'total': len(symbols), 'completed': 0, 'succeeded': 0, 'failed': 0}
+
+        client = self.client or self._default_client()
+        try:
+            results = []
+            tasks = [asyncio.ensure_future(self.ingest_symbol(client, bucket, semaphore, symbol)) for symbol in symbols]
+            for task in asyncio.as_completed(tasks):
+                result = await task
+                results.append(result)
+                progress['completed'] += 1
+                progress[result['status']] += 1
+                if self.on_progress is not None:
+                    self.on_progress({**progress, 'last': result})
+        finally:
+            if self.client is None:
+                await client.aclose()
+            await sync_to_async(close_old_connections)()
+
+        order = {symbol: position for position, symbol in enumerate(symbols)}
+        results.sort(key=lambda result: order[result['symbol']])
+        return {
+            **progress,
+            'elapsed_seconds': round(time.perf_counter() - started, 4),
+            'results': results,
+        }
+
+def ingest_symbols(symbols, predict=None, **options):
+    """
+    Synchronous entry point: run a BulkIngester over `symbols` and return its summary.
+
+    Afterwards, unless `predict` (default settings.PREDICT_AFTER_INGESTION) is
+    off, the prediction batch runs for every symbol that received new bars.
+    """
+    summary = asyncio.run(BulkIngester(**options).run(symbols))
+    if predict is None:
+        predict = settings.PREDICT_AFTER_INGESTION
+    updated = [result['symbol'] for result in summary['results'] if result['status'] == 'succeeded' and result['inserted']]
+    if predict and updated:
+        summary['predictions'] = run_prediction_batch(updated)
+    return summary
+
+def _redis():
+    return get_redis_connection('default')
+
+def _store_job(job_id, fields):
+    key = JOB_KEY.format(job_id)
+    redis = _redis()
+    pipe = redis.pipeline()
+    pipe.hset(key, mapping={name: json.dumps(value, default=str) for name, value in fields.items()})
+    pipe.expire(key, JOB_TTL)
+    pipe.execute()
+
+def get_ingestion_job(job_id):
+    job = _redis().hgetall(JOB_KEY.format(job_id))
+    if not job:
+        return None
+    return {key.decode(): json.loads(value) for key, value in job.items()}
+
+def start_ingestion_job(symbols):
+    """
+    Run a bulk ingestion in a background thread and return its job id.
+
+    Progress is kept in Redis so any web process can report it.
+    """
+    job_id = uuid.uuid4().hex
+    _store_job(job_id, {
+        'job_id': job_id,
+        'status': RUNNING,
+        'symbols': symbols,
+        'total': len(symbols),
+        'completed': 0,
+        'succeeded': 0,
+        'failed': 0,
+        'created_at': timezone.now().isoformat(),
+    })
+
+    def on_progress(progress):
+        _store_job(job_id, {key: progress[key] for key in ('completed', 'succeeded', 'failed')})
+
+    def run():
+        try:
+            summary = ingest_symbols(symbols, on_progress=on_progress)
+            _store_job(job_id, {
+                'status': FINISHED,
+                'elapsed_seconds': summary['elapsed_seconds'],
+                'results': summary['results'],
+                'predictions': summary.get('predictions'),
+                'finished_at': timezone.now().isoformat(),
+            })
+        except Exception as e:
+            logger.error(f"Ingestion job {job_id} crashed: {str(e)}")
+            _store_job(job_id, {'status': FAILED, 'error': str(e), 'finished_at': timezone.now().isoformat()})
+
+    threading.Thread(target=run, name=f"ingestion-{job_id}", daemon=True).start()
+    logger.info(f"Started ingestion job {job_id} for {len(symbols)} symbols")
+    return job_id
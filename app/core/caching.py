@@ -0,0 +1,183 @@
+import math
+import time
+import uuid
+import atexit
+import random
+import logging
+import threading
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+from .tiered_cache import tiered_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 60 * 60
+LOCK_TIMEOUT = 60
+WAIT_TIMEOUT = 10
+WAIT_INTERVAL = 0.05
+# Higher values refresh earlier; 1.0 is the standard XFetch setting.
+EARLY_REFRESH_BETA = 1.0
+STATS_KEY = 'cache_stats'
+STATS_FLUSH_INTERVAL = getattr(settings, 'CACHE_STATS_FLUSH_INTERVAL', 10)
+
+def _version_key(symbol):
+    return f"symbol_version:{symbol}"
+
+def symbol_version(symbol):
+    """
+    Current data version of a symbol, used in every cache key derived from its prices.
+
+    Symbols that were never ingested are version 0; nothing is written for
+    them, so lookups of arbitrary symbols leave no keys behind.
+    """
+    version = tiered_cache.get(_version_key(symbol))
+    return 0 if version is None else version
+
+def bump_symbol_version(symbol):
+    """
+    Invalidate every versioned cache entry of a symbol, e.g. after new bars are ingested.
+
+    A missing version starts from the current time in milliseconds, so losing
+    the version key never brings back entries cached under an older version;
+    entries cached under version 0 expire with their timeout.
+    """
+    key = _version_key(symbol)
+    version = int(time.time() * 1000)
+    if not cache.add(key, version, timeout=None):
+        try:
+            version = cache.incr(key)
+        except ValueError:
+            cache.set(key, version, timeout=None)
+    tiered_cache.invalidate(key)
+    logger.info(f"Cache version for {symbol} bumped to {version}")
+    return version
+
+def versioned_key(name, symbol, *parts):
+    return ':'.join([name, symbol, f"v{symbol_version(symbol)}", *map(str, parts)])
+
+class CacheStatsRecorder:
+    """
+    Cache hit/miss counters kept in process and added to the shared Redis hash periodically.
+
+    Recording an event only bumps a local counter, so L1 hits never touch Redis;
+    a daemon thread flushes the counts every `interval` seconds in one pipeline.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.counts = Counter()
+        self.lock = threading.Lock()
+        self.flusher = None
+
+    def record(self, name, event):
+        self._ensure_flusher()
+        with self.lock:
+            self.counts[f"{name}:{event}"] += 1
+
+    def flush(self):
+        with self.lock:
+            counts, self.counts = self.counts, Counter()
+        if not counts:
+            return
+        try:
+            pipeline = get_redis_connection('default').pipeline(transaction=False)
+            for field, count in counts.items():
+                pipeline.hincrby(STATS_KEY, field, count)
+            pipeline.execute()
+        except Exception as e:
+            logger.debug(f"Could not flush cache statistics: {str(e)}")
+            with self.lock:
+                self.counts.update(counts)
+
+    def _ensure_flusher(self):
+        if self.flusher is not None and self.flusher.is_alive():
+            return
+        with self.lock:
+            if self.flusher is None or not self.flusher.is_alive():
+                self.flusher = threading.Thread(target=self._flush_periodically, name='cache-stats', daemon=True)
+                self.flusher.start()
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+cache_stats_recorder = CacheStatsRecorder(STATS_FLUSH_INTERVAL)
+atexit.register(cache_stats_recorder.flush)
+
+def record_cache_event(name, event):
+    cache_stats_recorder.record(name, event)
+
+def cache_stats():
+    """
+    Per-key hit/miss/refresh counters as {name: {"hits": n, "misses": n, ...}}.
+
+    Counts of other processes can lag by up to CACHE_STATS_FLUSH_INTERVAL seconds.
+    """
+    cache_stats_recorder.flush()
+    stats = {}
+    for field, count in get_redis_connection('default').hgetall(STATS_KEY).items():
+        name, event = field.decode().rsplit(':', 1)
+        stats.setdefault(name, {})[event] = int(count)
+    return stats
+
+def _should_refresh_early(delta, expiry, beta):
+    # XFetch: refresh with a probability that rises as expiry approaches, scaled by how long a recompute takes.
+    return time.time() - delta * beta * math.log(1.0 - random.random()) >= expiry
+
+def _compute_and_store(key, compute, timeout):
+    started = time.time()
+    value = compute()
+    delta = time.time() - started
+    if value is not None:
+        tiered_cache.set(key, (value, delta, time.time() + timeout), timeout=timeout)
+    return value
+
+def prime_cache(key, value, timeout=DEFAULT_TIMEOUT):
+    """Store a precomputed value in the format cached_compute() reads, e.g. to warm it ahead of requests."""
+    return _compute_and_store(key, lambda: value, timeout)
+
+def cached_compute(key, compute, timeout=DEFAULT_TIMEOUT, stats_name=None, beta=EARLY_REFRESH_BETA):
+    """
+    Read-through cache with single-flight recomputation and early probabilistic refresh.
+
+    Only the caller that wins the lock recomputes a missing or soon-to-expire
+    entry; others keep serving the current value or, on a cold miss, wait for
+    the winner's result. A compute() result of None is returned but not cached.
+    """
+    stats_name = stats_name or key
+    entry = tiered_cache.get(key)
+    if entry is not None:
+        value, delta, expiry = entry
+        if not _should_refresh_early(delta, expiry, beta):
+            record_cache_event(stats_name, 'hits')
+            return value
+        record_cache_event(stats_name, 'early_refreshes')
+    else:
+        record_cache_event(stats_name, 'misses')
+
+    lock_key = f"lock:{key}"
+    token = uuid.uuid4().hex
+    if cache.add(lock_key, token, timeout=LOCK_TIMEOUT):
+        try:
+            return _compute_and_store(key, compute, timeout)
+        finally:
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+    if entry is not None:
+        return entry[0]
+
+    deadline = time.time() + WAIT_TIMEOUT
+    while time.time() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        entry = tiered_cache.get(key)
+        if entry is not None:
+            return entry[0]
+        if cache.get(lock_key) is None:
+            break
+
+    logger.warning(f"Gave up waiting for {key} to be recomputed; computing it directly")
+    return _compute_and_store(key, compute, timeout)
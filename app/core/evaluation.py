@@ -0,0 +1,118 @@
+import time
+import logging
+from decimal import Decimal
+from itertools import groupby, repeat
+import numpy as np
+import pandas as pd
+from django.db import transaction
+from .models import StockPrediction
+from .prediction import bar_days, match_days, walk_forward_errors
+from .process_pool import pool_map, MAX_PROCESS_WORKERS
+from .series_store import get_series
+
+logger = logging.getLogger(__name__)
+
+MAX_EVALUATION_WORKERS = MAX_PROCESS_WORKERS
+EVALUATION_DAYS = 30
+BACKFILL_BATCH_SIZE = 1000
+
+def backfill_actual_prices(symbols=None, batch_size=BACKFILL_BATCH_SIZE):
+    """
+    Fill StockPrediction.actual_price with the close of the bar on each prediction date.
+
+    Pending predictions are read in one pass ordered by symbol; each symbol's
+    dates are matched against its stored series in one vectorized lookup and
+    the rows are written back with bulk_update. Dates without a bar stay empty.
+    Returns the number of predictions updated.
+    """
+    pending = StockPrediction.objects.filter(
+        actual_price__isnull=True, prediction_date__lte=pd.Timestamp.now().date()
+    )
+    if symbols is not None:
+        pending = pending.filter(symbol__in=symbols)
+    pending = pending.order_by('symbol', 'prediction_date').only('id', 'symbol', 'prediction_date')
+
+    updated, batch = 0, []
+    epoch = pd.Timestamp('1970-01-01').date()
+    for symbol, rows in groupby(pending.iterator(chunk_size=batch_size), key=lambda row: row.symbol):
+        rows = list(rows)
+        series = get_series(symbol, columns=('timestamp', 'close'))
+        if series is None or not len(series['timestamp']):
+            continue
+        targets = np.array([(row.prediction_date - epoch).days for row in rows], dtype=np.int64)
+        index, matched = match_days(bar_days(series['timestamp']), targets)
+        for row, i, found in zip(rows, index, matched):
+            if found:
+                row.actual_price = Decimal(f"{series['close'][i]:.2f}")
+                batch.append(row)
+
+        if len(batch) >= batch_size:
+            updated += _write_actual_prices(batch, batch_size)
+            batch = []
+    updated += _write_actual_prices(batch, batch_size)
+
+    logger.info(f"Backfilled actual prices for {updated} predictions")
+    return updated
+
+def _write_actual_prices(rows, batch_size):
+    if rows:
+        with transaction.atomic():
+            StockPrediction.objects.bulk_update(rows, ['actual_price'], batch_size=batch_size)
+    return len(rows)
+
+def load_evaluation_series(symbols):
+    """Load the timestamps and closes of several symbols from the series store, keyed by symbol."""
+    series = {}
+    for symbol in symbols:
+        stored = get_series(symbol, columns=('timestamp', 'close'))
+        if stored is not None and len(stored['close']) > 1:
+            series[symbol] = (np.asarray(stored['timestamp']), np.asarray(stored['close']))
+    return series
+
+def run_evaluation(model, series, days=EVALUATION_DAYS, step=1, max_workers=MAX_EVALUATION_WORKERS):
+    """
+    Walk-forward evaluation of a model over preloaded series, with MAE and MAPE per horizon.
+
+    Symbols are spread across the shared process pool, each worker receiving
+    the arrays it needs, like the backtest sweep; the per-symbol error sums
+    are combined here.
+    """
+    started = time.perf_counter()
+    symbols = list(series)
+    timestamps = [series[symbol][0] for symbol in symbols]
+    closes = [series[symbol][1] for symbol in symbols]
+
+    workers = min(max_workers, len(symbols))
+    if workers > 1:
+        # Workers only import the prediction module, which needs no Django setup.
+        results = pool_map(walk_forward_errors, repeat(model, len(symbols)), timestamps, closes,
+                           repeat(days, len(symbols)), repeat(step, len(symbols)),
+                           max_workers=workers, chunksize=max(1, len(symbols) // (workers * 4)))
+    else:
+        results = [walk_forward_errors(model, *series[symbol], days, step) for symbol in symbols]
+
+    count = sum((result['count'] for result in results), np.zeros(days, dtype=np.int64))
+    abs_error = sum((result['abs_error'] for result in results), np.zeros(days))
+    pct_error = sum((result['pct_error'] for result in results), np.zeros(days))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mae = abs_error / count
+        mape = pct_error / count * 100
+    horizons = [
+        {
+            'horizon': horizon,
+            'observations': int(count[horizon - 1]),
+            'mae': round(float(mae[horizon - 1]), 4) if count[horizon - 1] else None,
+            'mape_percentage': round(float(mape[horizon - 1]), 2) if count[horizon - 1] else None,
+        }
+        for horizon in range(1, days + 1)
+    ]
+    summary = {
+        'symbols': len(symbols),
+        'origins': sum(result['origins'] for result in results),
+        'elapsed_seconds': round(time.perf_counter() - started, 4),
+        'horizons': horizons,
+    }
+    logger.info(f"Evaluated {summary['origins']} forecast origins across {len(symbols)} symbols "
+                f"on {workers or 1} workers in {summary['elapsed_seconds']}s")
+    return summary
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+
+SMA_WINDOWS = (30, 50, 200)
+EMA_SPANS = (12, 26)
+RSI_PERIOD = 14
+BOLLINGER_WINDOW = 20
+BOLLINGER_WIDTH = 2.0
+VWAP_WINDOW = 20
+
+INDICATOR_NAMES = (
+    [f'sma_{window}' for window in SMA_WINDOWS]
+    + [f'ema_{span}' for span in EMA_SPANS]
+    + [f'rsi_{RSI_PERIOD}', 'bollinger_middle', 'bollinger_upper', 'bollinger_lower', f'vwap_{VWAP_WINDOW}']
+)
+# Bars of history the window-based indicators need before the first appended bar.
+LOOKBACK = max(SMA_WINDOWS + (BOLLINGER_WINDOW, VWAP_WINDOW)) - 1
+
+def sma(values, window):
+    """Trailing simple moving average, NaN until the window is full."""
+    return pd.Series(values, copy=False).rolling(window=window).mean().to_numpy()
+
+def ema(values, span, previous=None):
+    """
+    Exponential moving average with alpha = 2 / (span + 1).
+
+    The recursion starts at the first value, or continues from `previous`, the
+    average at the bar before values[0].
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if previous is None:
+        return pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+    seeded = np.concatenate(([previous], values))
+    return pd.Series(seeded).ewm(span=span, adjust=False).mean().to_numpy()[1:]
+
+def _wilder(values, period, previous):
+    seeded = np.concatenate(([previous], values))
+    return pd.Series(seeded).ewm(alpha=1 / period, adjust=False).mean().to_numpy()[1:]
+
+def _rsi_from_averages(avg_gain, avg_loss):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+
+def rsi(close, period=RSI_PERIOD, state=None):
+    """
+    Wilder's relative strength index. Returns (values, state).
+
+    Without a state, the averages are seeded with the mean move of the first
+    `period` bars and the first value lands on bar `period`. With the state of
+    a previous call, only the given new closes are processed.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    if state is not None:
+        deltas = np.diff(np.concatenate(([state['last_close']], close)))
+        avg_gain = _wilder(np.clip(deltas, 0, None), period, state['avg_gain'])
+        avg_loss = _wilder(np.clip(-deltas, 0, None), period, state['avg_loss'])
+        values = _rsi_from_averages(avg_gain, avg_loss)
+    else:
+        values = np.full(len(close), np.nan)
+        if len(close) <= period:
+            return values, None
+        deltas = np.diff(close)
+        gains, losses = np.clip(deltas, 0, None), np.clip(-deltas, 0, None)
+        avg_gain = _wilder(gains[period:], period, gains[:period].mean())
+        avg_loss = _wilder(losses[period:], period, losses[:period].mean())
+        avg_gain = np.concatenate(([gains[:period].mean()], avg_gain))
+        avg_loss = np.concatenate(([losses[:period].mean()], avg_loss))
+        values[period:] = _rsi_from_averages(avg_gain, avg_loss)
+
+    state = {'avg_gain': float(avg_gain[-1]), 'avg_loss': float(avg_loss[-1]), 'last_close': float(close[-1])}
+    return values, state
+
+def bollinger(close, window=BOLLINGER_WINDOW, width=BOLLINGER_WIDTH):
+    """Bollinger bands as (middle, upper, lower), using the population standard deviation."""
+    rolling = pd.Series(close, copy=False).rolling(window=window)
+    middle = rolling.mean().to_numpy()
+    deviation = rolling.std(ddof=0).to_numpy()
+    return middle, middle + width * deviation, middle - width * deviation
+
+def vwap(high, low, close, volume, window=VWAP_WINDOW):
+    """Rolling volume-weighted average of the typical price (high + low + close) / 3."""
+    typical = (np.asarray(high) + np.asarray(low) + np.asarray(close)) / 3
+    volume = np.asarray(volume, dtype=np.float64)
+    traded = pd.Series(typical * volume).rolling(window=window).sum().to_numpy()
+    total = pd.Series(volume).rolling(window=window).sum().to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(total > 0, traded / total, np.nan)
+
+def _window_indicators(prices):
+    close = prices['close']
+    values = {f'sma_{window}': sma(close, window) for window in SMA_WINDOWS}
+    values['bollinger_middle'], values['bollinger_upper'], values['bollinger_lower'] = bollinger(close)
+    values[f'vwap_{VWAP_WINDOW}'] = vwap(prices['high'], prices['low'], close, prices['volume'])
+    return values
+
+def compute_indicators(prices):
+    """
+    Compute every indicator over full price arrays (close, high, low, volume).
+
+    Returns ({name: float64 array}, state), where state lets update_indicators
+    continue the recursive indicators later.
+    """
+    close = prices['close']
+    values = _window_indicators(prices)
+    for span in EMA_SPANS:
+        values[f'ema_{span}'] = ema(close, span)
+    values[f'rsi_{RSI_PERIOD}'], rsi_state = rsi(close)
+    return values, {f'rsi_{RSI_PERIOD}': rsi_state}
+
+def update_indicators(prices, start, previous, state):
+    """
+    Extend indicators computed for the first `start` bars to the bars appended after them.
+
+    Window indicators are evaluated on the last LOOKBACK + appended bars only and
+    the recursive ones continue from their last value, so the cost is
+    O(appended bars) whatever the length of the history. Falls back to
+    compute_indicators while the history is too short to have a state.
+    """
+    rsi_state = (state or {}).get(f'rsi_{RSI_PERIOD}')
+    if start < LOOKBACK or rsi_state is None:
+        return compute_indicators(prices)
+
+    appended = len(prices['close']) - start
+    window = _window_indicators({name: values[start - LOOKBACK:] for name, values in prices.items()})
+    new = {name: values[-appended:] for name, values in window.items()}
+    close = prices['close'][start:]
+    for span in EMA_SPANS:
+        new[f'ema_{span}'] = ema(close, span, previous[f'ema_{span}'][start - 1])
+    new[f'rsi_{RSI_PERIOD}'], rsi_state = rsi(close, state=rsi_state)
+
+    values = {name: np.concatenate((previous[name][:start], new[name])) for name in INDICATOR_NAMES}
+    return values, {f'rsi_{RSI_PERIOD}': rsi_state}
@@ -0,0 +1,211 @@
+import re
+import json
+import time
+import logging
+import pandas as pd
+from datetime import timezone
+from django.db.models import Max
+from .models import StockPrice
+from .caching import bump_symbol_version
+from .series_store import refresh_series
+
+logger = logging.getLogger(__name__)
+
+# Alpha Vantage daily bar keys mapped to StockPrice columns.
+ALPHA_VANTAGE_FIELDS = {
+    '1. open': 'open',
+    '2. high': 'high',
+    '3. low': 'low',
+    '4. close': 'close',
+    '5. volume': 'volume',
+}
+PRICE_COLUMNS = ['open', 'high', 'low', 'close']
+# DecimalField(max_digits=10, decimal_places=4) leaves six integer digits.
+MAX_PRICE = 10 ** 6
+BULK_BATCH_SIZE = 500
+
+def _as_utc(value):
+    timestamp = pd.Timestamp(value)
+    return timestamp.tz_localize(timezone.utc) if timestamp.tzinfo is None else timestamp.tz_convert(timezone.utc)
+
+def parse_time_series(time_series, since=None):
+    """Turn an Alpha Vantage 'Time Series (Daily)' mapping into a typed DataFrame."""
+    if not time_series:
+        return pd.DataFrame(columns=['timestamp'] + PRICE_COLUMNS + ['volume'])
+
+    frame = pd.DataFrame.from_dict(time_series, orient='index').rename(columns=ALPHA_VANTAGE_FIELDS)
+    frame.index = pd.to_datetime(frame.index, format='%Y-%m-%d', errors='coerce', utc=True)
+    frame.index.name = 'timestamp'
+    frame = frame[frame.index.notna()]
+
+    if since is not None:
+        frame = frame[frame.index >= _as_utc(since)]
+
+    for column in PRICE_COLUMNS + ['volume']:
+        frame[column] = pd.to_numeric(frame[column], errors='coerce') if column in frame else float('nan')
+
+    return frame.reset_index().sort_values('timestamp', ignore_index=True)
+
+class RateLimited(Exception):
+    """Alpha Vantage answered with its quota notice instead of a time series."""
+
+class SymbolNotFound(Exception):
+    pass
+
+# One flat daily bar, e.g. "2024-10-18": {"1. open": "230.1000", ...}; meta data values are never objects.
+BAR_PATTERN = re.compile(rb'"(\d{4}-\d{2}-\d{2})"\s*:\s*\{([^{}]*)\}')
+
+class DailySeriesParser:
+    """
+    Incremental parser for Alpha Vantage TIME_SERIES_DAILY response bodies.
+
+    Feed it the body chunk by chunk; complete bars are picked out of a small
+    rolling buffer, so only the bars on or after `since` are ever held as
+    Python objects. Alpha Vantage lists bars newest first, so feed() returns
+    True at the first bar older than the cutoff and the rest of the body need
+    not be downloaded. If the bars turn out not to be in descending order, the
+    whole body is consumed instead.
+    """
+
+    def __init__(self, since=None):
+        self.since = since
+        self.cutoff = None
+        if since is not None:
+            since = _as_utc(since)
+            day = since.normalize()
+            self.cutoff = (day if day == since else day + pd.Timedelta(days=1)).strftime('%Y-%m-%d').encode()
+        self.buffer = bytearray()
+        self.bars = {}
+        self.bars_seen = 0
+        self.previous_date = None
+        self.descending = True
+        self.done = False
+
+    def feed(self, chunk):
+        if self.done:
+            return True
+        self.buffer += chunk
+        consumed = 0
+        for match in BAR_PATTERN.finditer(self.buffer):
+            consumed = match.end()
+            date = match.group(1)
+            self.bars_seen += 1
+            if self.previous_date is not None and date > self.previous_date:
+                self.descending = False
+            self.previous_date = date
+
+            if self.cutoff is not None and date < self.cutoff:
+                if self.descending:
+                    self.done = True
+                    break
+                continue
+            self.bars[date.decode()] = json.loads(b'{' + match.group(2) + b'}')
+        del self.buffer[:consumed]
+        return self.done
+
+    def frame(self):
+        """The parsed bars as the typed frame parse_time_series() returns."""
+        return parse_time_series(self.bars, since=self.since)
+
+    def payload(self):
+        """The decoded body of a response without bars (e.g. an error or quota notice), or {}."""
+        if self.bars_seen:
+            return {}
+        try:
+            return json.loads(bytes(self.buffer))
+        except ValueError:
+            return {}
+
+    def check(self):
+        """Raise SymbolNotFound or RateLimited if the body held no bars, e.g. an error or quota notice."""
+        if self.bars_seen:
+            return
+        data = self.payload()
+        if 'Error Message' in data:
+            raise SymbolNotFound(data['Error Message'])
+        raise RateLimited(data.get('Note') or data.get('Information') or 'No time series in response')
+
+def validate_price_frame(frame):
+    """Vectorized equivalent of StockPriceSerializer field validation. Returns (valid, rejected_count)."""
+    prices = frame[PRICE_COLUMNS]
+    valid = (
+        prices.notna().all(axis=1)
+        & (prices >= 0).all(axis=1)
+        & (prices < MAX_PRICE).all(axis=1)
+        & frame['volume'].notna()
+        & (frame['volume'] >= 0)
+        & (frame['volume'] % 1 == 0)
+    )
+    return frame[valid], int((~valid).sum())
+
+def existing_timestamps(symbol, start=None):
+    """Load the stored timestamps for a symbol in a single query."""
+    queryset = StockPrice.objects.filter(symbol=symbol)
+    if start is not None:
+        queryset = queryset.filter(timestamp__gte=start)
+    return pd.to_datetime(list(queryset.values_list('timestamp', flat=True)), utc=True)
+
+def latest_timestamp(symbol):
+    """High-water mark of a symbol: its newest stored bar timestamp, or None."""
+    return StockPrice.objects.filter(symbol=symbol).aggregate(latest=Max('timestamp'))['latest']
+
+def bulk_ingest(symbol, frame, batch_size=BULK_BATCH_SIZE):
+    """
+    Write the new rows of a parsed price frame for a symbol.
+
+    Existing timestamps are loaded once and filtered out in memory; the rest are
+    written with bulk_create in batches, relying on the unique_stock_price
+    constraint to drop any rows inserted concurrently. 'inserted' counts the
+    rows actually stored (the symbol's row count from the frame's first bar,
+    right before and after the write), so rows a concurrent refresh got in
+    first count as skipped.
+    """
+    started = time.perf_counter()
+    total = len(frame)
+
+    frame, rejected = validate_price_frame(frame)
+    if rejected:
+        logger.warning(f"Dropped {rejected} invalid bars for {symbol}")
+
+    if not frame.empty:
+        start = frame['timestamp'].min().to_pydatetime()
+        stored = existing_timestamps(symbol, start=start)
+        frame = frame[~frame['timestamp'].isin(stored)]
+
+    rows = [
+        StockPrice(
+            symbol=symbol,
+            timestamp=timestamp.to_pydatetime(),
+            open=round(open_price, 4),
+            close=round(close_price, 4),
+            high=round(high_price, 4),
+            low=round(low_price, 4),
+            volume=int(volume),
+        )
+        for timestamp, open_price, close_price, high_price, low_price, volume in zip(
+            frame['timestamp'], frame['open'], frame['close'], frame['high'], frame['low'], frame['volume']
+        )
+    ]
+    inserted = 0
+    if rows:
+        in_range = StockPrice.objects.filter(symbol=symbol, timestamp__gte=start)
+        before = in_range.count()
+        StockPrice.objects.bulk_create(rows, batch_size=batch_size, ignore_conflicts=True)
+        inserted = in_range.count() - before
+    if inserted:
+        try:
+            refresh_series(symbol)
+        except OSError as e:
+            # Readers fall back to rebuilding the arrays on their next load.
+            logger.error(f"Could not refresh the series store for {symbol}: {str(e)}")
+        bump_symbol_version(symbol)
+
+    result = {
+        'symbol': symbol,
+        'inserted': inserted,
+        'skipped': total - inserted,
+        'elapsed_seconds': round(time.perf_counter() - started, 4),
+    }
+    logger.info(f"Ingested {result['inserted']} bars for {symbol} "
+                f"({result['skipped']} skipped) in {result['elapsed_seconds']}s")
+    return result
@@ -0,0 +1,84 @@
+import time
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+from app.core.backtesting import run_backtest
+
+def iterrows_backtest(prices, initial_investment):
+    """The original row-by-row implementation of backtest_strategy, kept as the baseline."""
+    cash = initial_investment
+    shares = 0
+    total_return = 0
+    max_drawdown = 0
+    max_value = initial_investment
+    trades = 0
+
+    prices = prices.copy()
+    prices['50_MA'] = prices['close'].rolling(window=50).mean()
+    prices['200_MA'] = prices['close'].rolling(window=200).mean()
+
+    for _, row in prices.iterrows():
+        close_price = row['close']
+        moving_average_50 = row['50_MA']
+        moving_average_200 = row['200_MA']
+
+        if pd.notna(close_price) and pd.notna(moving_average_50) and pd.notna(moving_average_200):
+            if close_price < moving_average_50 and shares == 0:
+                shares = cash / close_price
+                cash = 0
+                trades += 1
+            elif close_price > moving_average_200 and shares > 0:
+                cash = shares * close_price
+                shares = 0
+                trades += 1
+
+                portfolio_value = cash
+                total_return = (portfolio_value - initial_investment) / initial_investment * 100
+                max_value = max(max_value, portfolio_value)
+                drawdown = (max_value - portfolio_value) / max_value * 100
+                max_drawdown = max(max_drawdown, drawdown)
+
+    return {
+        'total_return_percentage': round(total_return, 2),
+        'max_drawdown_percentage': round(max_drawdown, 2),
+        'number_of_trades': trades,
+        'final_cash': round(cash, 2)
+    }
+
+def random_walk(bars, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, bars)))
+    index = pd.date_range('2000-01-01', periods=bars, freq='D')
+    return pd.DataFrame({'close': close}, index=index)
+
+def best_of(repeat, func, *args):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+class Command(BaseCommand):
+    help = "Compare the vectorized backtest engine against the original iterrows loop."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[1_000, 10_000, 100_000])
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--initial-investment', type=float, default=10000.0)
+
+    def handle(self, *args, **options):
+        initial_investment = options['initial_investment']
+        self.stdout.write(f"{'bars':>10} {'iterrows (ms)':>15} {'vectorized (ms)':>17} {'speedup':>9}")
+
+        for bars in options['sizes']:
+            prices = random_walk(bars)
+            loop_time, expected = best_of(options['repeat'], iterrows_backtest, prices, initial_investment)
+            fast_time, actual = best_of(options['repeat'], run_backtest, prices['close'].to_numpy(), initial_investment)
+
+            if actual != expected:
+                raise CommandError(f"Result mismatch at {bars} bars: {actual} != {expected}")
+
+            self.stdout.write(
+                f"{bars:>10} {loop_time * 1000:>15.2f} {fast_time * 1000:>17.2f} {loop_time / fast_time:>8.1f}x"
+            )
@@ -0,0 +1,101 @@
+import json
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from app.core.ingestion import DailySeriesParser, parse_time_series
+
+CHUNK_SIZE = 64 * 1024
+
+def synthetic_payload(years, seed=0):
+    """A TIME_SERIES_DAILY outputsize=full body in Alpha Vantage's layout, newest bar first."""
+    days = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=years * 252)[::-1]
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(days))))
+    body = {
+        "Meta Data": {
+            "1. Information": "Daily Prices (open, high, low, close) and Volumes",
+            "2. Symbol": "BENCH",
+            "3. Last Refreshed": days[0].strftime('%Y-%m-%d'),
+            "4. Output Size": "Full size",
+            "5. Time Zone": "US/Eastern",
+        },
+        "Time Series (Daily)": {
+            day.strftime('%Y-%m-%d'): {
+                "1. open": f"{price * 0.995:.4f}",
+                "2. high": f"{price * 1.01:.4f}",
+                "3. low": f"{price * 0.99:.4f}",
+                "4. close": f"{price:.4f}",
+                "5. volume": str(int(rng.integers(10 ** 5, 10 ** 7))),
+            }
+            for day, price in zip(days, close)
+        },
+    }
+    return json.dumps(body, indent=4).encode()
+
+def chunks(body):
+    for start in range(0, len(body), CHUNK_SIZE):
+        yield body[start:start + CHUNK_SIZE]
+
+def buffered_parse(body, since):
+    """The original path: read the whole body, json-decode it, then filter by date."""
+    content = b''.join(chunks(body))
+    return parse_time_series(json.loads(content).get('Time Series (Daily)', {}), since=since), len(content)
+
+def streaming_parse(body, since):
+    parser = DailySeriesParser(since)
+    consumed = 0
+    for chunk in chunks(body):
+        consumed += len(chunk)
+        if parser.feed(chunk):
+            break
+    return parser.frame(), consumed
+
+def measure(func, *args):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, elapsed, result
+
+class Command(BaseCommand):
+    help = "Compare peak memory of buffered vs streaming parsing of a TIME_SERIES_DAILY payload."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fixture', help="A recorded outputsize=full response body; synthesized when omitted")
+        parser.add_argument('--years', type=int, default=25, help="History length of the synthesized payload")
+        parser.add_argument('--history-days', type=int, default=2 * 365)
+        parser.add_argument('--max-ratio', type=float, default=0.25,
+                            help="Fail if streaming peak memory exceeds this fraction of the buffered peak")
+
+    def handle(self, *args, **options):
+        if options['fixture']:
+            with open(options['fixture'], 'rb') as f:
+                body = f.read()
+        else:
+            body = synthetic_payload(options['years'])
+        since = datetime.now() - timedelta(days=options['history_days'])
+
+        buffered_peak, buffered_time, (expected, buffered_bytes) = measure(buffered_parse, body, since)
+        streaming_peak, streaming_time, (actual, streaming_bytes) = measure(streaming_parse, body, since)
+
+        if not actual.equals(expected):
+            raise CommandError("Streaming parser produced a different frame than the buffered parser")
+
+        self.stdout.write(f"payload: {len(body) / 2 ** 20:.2f} MiB, {len(expected)} bars since {since:%Y-%m-%d}")
+        self.stdout.write(f"{'parser':>10} {'peak (MiB)':>11} {'time (ms)':>10} {'read (MiB)':>11}")
+        for name, peak, elapsed, consumed in [
+            ('buffered', buffered_peak, buffered_time, buffered_bytes),
+            ('streaming', streaming_peak, streaming_time, streaming_bytes),
+        ]:
+            self.stdout.write(f"{name:>10} {peak / 2 ** 20:>11.2f} {elapsed * 1000:>10.1f} {consumed / 2 ** 20:>11.2f}")
+
+        ratio = streaming_peak / buffered_peak
+        message = f"Streaming peak is {ratio:.1%} of buffered peak (budget {options['max_ratio']:.0%})"
+        if ratio > options['max_ratio']:
+            raise CommandError(message)
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,53 @@
+import time
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from app.core.backtesting import run_backtest
+from app.core.portfolio import run_portfolio_backtest
+
+TRADING_DAYS_PER_YEAR = 252
+
+def random_walks(bars, symbols, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (bars, symbols)), axis=0))
+
+class Command(BaseCommand):
+    help = "Time the portfolio backtest engine on a dates x symbols matrix and fail above a latency budget."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--symbols', type=int, default=500)
+        parser.add_argument('--years', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--initial-investment', type=float, default=1_000_000.0)
+        parser.add_argument('--budget-seconds', type=float, default=1.0)
+        parser.add_argument('--check-symbols', type=int, default=20,
+                            help="Columns compared against the single-symbol engine")
+
+    def handle(self, *args, **options):
+        bars = options['years'] * TRADING_DAYS_PER_YEAR
+        close = random_walks(bars, options['symbols'])
+
+        timings = []
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            result = run_portfolio_backtest(close, options['initial_investment'])
+            timings.append(time.perf_counter() - started)
+
+        # Every sleeve must trade exactly like a single-symbol backtest of its column.
+        sleeve = options['initial_investment'] / options['symbols']
+        for j in range(min(options['check_symbols'], options['symbols'])):
+            expected = run_backtest(close[:, j], sleeve)
+            if expected['number_of_trades'] != result['symbol_trades'][j]:
+                raise CommandError(f"Trade count mismatch in column {j}: "
+                                   f"{result['symbol_trades'][j]} != {expected['number_of_trades']}")
+            if expected['number_of_trades'] % 2 == 0 and abs(expected['final_cash'] - result['symbol_values'][j]) > 0.01:
+                raise CommandError(f"Final value mismatch in column {j}: "
+                                   f"{result['symbol_values'][j]:.2f} != {expected['final_cash']}")
+
+        best = min(timings)
+        self.stdout.write(
+            f"{options['symbols']} symbols x {bars} bars: best {best * 1000:.1f} ms of {options['repeat']}; "
+            f"{result['number_of_trades']} trades, total return {result['total_return_percentage']}%, "
+            f"max drawdown {result['max_drawdown_percentage']}%"
+        )
+        if best > options['budget_seconds']:
+            raise CommandError(f"Portfolio backtest took {best:.2f}s, budget is {options['budget_seconds']}s")
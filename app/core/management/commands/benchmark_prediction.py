@@ -0,0 +1,52 @@
+import time
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from app.core.prediction import forecast
+from app.core.model_registry import registry
+
+def loop_forecast(model, last_values, days):
+    """The original one-predict-call-per-step loop, applied to each series in turn."""
+    horizon = []
+    for last_prediction in last_values:
+        predictions = []
+        for _ in range(days):
+            next_prediction = model.predict(np.array([[last_prediction]]))[0]
+            predictions.append(next_prediction)
+            last_prediction = next_prediction
+        horizon.append(predictions)
+    return np.array(horizon)
+
+def best_of(repeat, func, *args):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+class Command(BaseCommand):
+    help = "Compare the closed-form/batched forecast against the per-step model.predict loop."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--symbols', nargs='+', type=int, default=[1, 10, 100, 500])
+        parser.add_argument('--days', type=int, default=30)
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--model-version', help="Model version (default: MODEL_VERSION)")
+
+    def handle(self, *args, **options):
+        model = registry.get(options['model_version'])
+        days = options['days']
+        rng = np.random.default_rng(0)
+        self.stdout.write(f"{'symbols':>8} {'loop (ms)':>12} {'engine (ms)':>12} {'speedup':>9}")
+
+        for count in options['symbols']:
+            last_values = rng.uniform(10, 500, count)
+            loop_time, expected = best_of(options['repeat'], loop_forecast, model, last_values, days)
+            fast_time, actual = best_of(options['repeat'], forecast, model, last_values, days)
+
+            if not np.allclose(actual, expected, rtol=1e-9):
+                raise CommandError(f"Forecast mismatch for {count} symbols")
+
+            self.stdout.write(
+                f"{count:>8} {loop_time * 1000:>12.2f} {fast_time * 1000:>12.3f} {loop_time / fast_time:>8.0f}x"
+            )
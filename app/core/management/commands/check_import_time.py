@@ -0,0 +1,83 @@
+import sys
+import json
+import resource
+import subprocess
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Heavy dependencies that must only load in the code paths that use them.
+DEFERRED_MODULES = ['pandas', 'numpy', 'matplotlib', 'weasyprint', 'sklearn', 'joblib', 'httpx']
+
+PROBE = (
+    "import sys, json, django\n"
+    "django.setup()\n"
+    "import {module}\n"
+    "print(json.dumps([name for name in {deferred!r} if name in sys.modules]))\n"
+)
+
+def parse_importtime(stderr):
+    """(depth, cumulative microseconds, module) for each line of `python -X importtime` output."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((depth, int(cumulative), name.strip()))
+    return entries
+
+def direct_imports(entries, module):
+    """The imports made by a top-level module, as (cumulative microseconds, name); importtime lists children first."""
+    end = next(i for i, (depth, _, name) in enumerate(entries) if depth == 0 and name == module)
+    start = end
+    while start > 0 and entries[start - 1][0] > 0:
+        start -= 1
+    return [(us, name) for depth, us, name in entries[start:end] if depth == 1]
+
+def probe(module, deferred):
+    """Import a module in a fresh interpreter after django.setup(); returns (importtime entries, deferred modules loaded)."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE.format(module=module, deferred=deferred)],
+        cwd=settings.BASE_DIR, capture_output=True, text=True,
+    )
+    if result.returncode:
+        raise CommandError(f"Importing {module} failed:\n{result.stderr.splitlines()[-1]}")
+    return parse_importtime(result.stderr), json.loads(result.stdout.splitlines()[-1])
+
+class Command(BaseCommand):
+    help = ("Measure the import time of modules every worker loads at startup (python -X importtime) and fail "
+            "above a budget or if a heavy dependency is imported eagerly.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('modules', nargs='*', default=['app.api.urls'])
+        parser.add_argument('--budget-ms', type=float, default=500.0)
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--top', type=int, default=8, help="Slowest imports to list")
+        parser.add_argument('--allow', nargs='*', default=[], help="Deferred modules that may be imported")
+
+    def handle(self, *args, **options):
+        deferred = [name for name in DEFERRED_MODULES if name not in options['allow']]
+        failures = []
+
+        for module in options['modules']:
+            runs = []
+            for _ in range(options['repeat']):
+                entries, loaded = probe(module, deferred)
+                total = next(us for depth, us, name in entries if depth == 0 and name == module)
+                runs.append((total, entries, loaded))
+            total, entries, loaded = min(runs, key=lambda run: run[0])
+            elapsed_ms = total / 1000
+
+            self.stdout.write(f"{module}: {elapsed_ms:.0f} ms (best of {options['repeat']}, budget {options['budget_ms']:.0f} ms)")
+            for us, name in sorted(direct_imports(entries, module), reverse=True)[:options['top']]:
+                self.stdout.write(f"  {us / 1000:>8.1f} ms  {name}")
+
+            if loaded:
+                failures.append(f"{module} imports {', '.join(loaded)} at startup")
+            if elapsed_ms > options['budget_ms']:
+                failures.append(f"{module} takes {elapsed_ms:.0f} ms to import, budget is {options['budget_ms']:.0f} ms")
+
+        # ru_maxrss of children is reported in KiB on Linux.
+        self.stdout.write(f"Peak RSS of the probe processes: {resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024:.0f} MiB")
+        if failures:
+            raise CommandError('; '.join(failures))
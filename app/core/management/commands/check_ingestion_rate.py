@@ -0,0 +1,54 @@
+import asyncio
+from django.core.management.base import BaseCommand, CommandError
+from app.core.bulk_ingestion import quota_bucket
+
+QUOTA_WINDOW = 60.0
+
+async def request_times(requests_per_minute, requests, concurrency):
+    """Times at which `requests` acquisitions from `concurrency` workers get a token, on a fake clock."""
+    now = [0.0]
+
+    async def sleep(seconds):
+        now[0] += seconds
+        await asyncio.sleep(0)
+
+    bucket = quota_bucket(requests_per_minute, clock=lambda: now[0], sleep=sleep)
+    queue = list(range(requests))
+    times = []
+
+    async def worker():
+        while queue:
+            queue.pop()
+            await bucket.acquire()
+            times.append(now[0])
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return sorted(times)
+
+def busiest_window(times, window=QUOTA_WINDOW):
+    """Most requests sent within any half-open window of `window` seconds."""
+    return max(sum(1 for other in times if start <= other < start + window) for start in times)
+
+class Command(BaseCommand):
+    help = "Simulate bulk ingestion's rate limiter on a fake clock and fail if any minute exceeds the quota."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests-per-minute', type=int, nargs='+', default=[1, 5, 75])
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+        parser.add_argument('--requests', type=int, default=200)
+
+    def handle(self, *args, **options):
+        failures = []
+        for requests_per_minute in options['requests_per_minute']:
+            for concurrency in options['concurrency']:
+                times = asyncio.run(request_times(requests_per_minute, options['requests'], concurrency))
+                first_minute = sum(1 for at in times if at < QUOTA_WINDOW)
+                busiest = busiest_window(times)
+                self.stdout.write(
+                    f"{requests_per_minute:>4} rpm, concurrency {concurrency:>3}: "
+                    f"{first_minute} requests in the first minute, at most {busiest} in any minute"
+                )
+                if max(first_minute, busiest) > requests_per_minute:
+                    failures.append(f"{requests_per_minute} rpm with concurrency {concurrency}")
+        if failures:
+            raise CommandError(f"Quota exceeded for {', '.join(failures)}")
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from app.core.model_registry import registry
+from app.core.prediction_batch import universe
+from app.core.evaluation import (
+    backfill_actual_prices, load_evaluation_series, run_evaluation, EVALUATION_DAYS, MAX_EVALUATION_WORKERS,
+)
+
+class Command(BaseCommand):
+    help = "Backfill realized prices of stored predictions and report walk-forward MAE/MAPE of the model per horizon."
+
+    def add_arguments(self, parser):
+        parser.add_argument('symbols', nargs='*', help="Limit the evaluation to these symbols (default: all)")
+        parser.add_argument('--days', type=int, default=EVALUATION_DAYS, help="Forecast horizon in days")
+        parser.add_argument('--step', type=int, default=1, help="Bars between forecast origins")
+        parser.add_argument('--workers', type=int, default=MAX_EVALUATION_WORKERS)
+        parser.add_argument('--model-version', help="Model version to evaluate (default: MODEL_VERSION)")
+        parser.add_argument('--no-backfill', action='store_true')
+
+    def handle(self, *args, **options):
+        version = options['model_version']
+        if version is not None and version not in registry.versions():
+            raise CommandError(f"Unknown model version '{version}'; available: {', '.join(registry.versions()) or 'none'}")
+
+        symbols = options['symbols'] or universe()
+        if not options['no_backfill']:
+            updated = backfill_actual_prices(symbols=options['symbols'] or None)
+            self.stdout.write(f"Backfilled actual prices for {updated} predictions")
+
+        series = load_evaluation_series(symbols)
+        if not series:
+            raise CommandError("No stored prices to evaluate")
+        summary = run_evaluation(registry.get(version), series, days=options['days'], step=options['step'], max_workers=options['workers'])
+
+        self.stdout.write(f"{summary['symbols']} symbols, {summary['origins']} origins in {summary['elapsed_seconds']}s")
+        self.stdout.write(f"{'horizon':>8} {'observations':>13} {'MAE':>10} {'MAPE (%)':>9}")
+        for row in summary['horizons']:
+            mae = '-' if row['mae'] is None else f"{row['mae']:.4f}"
+            mape = '-' if row['mape_percentage'] is None else f"{row['mape_percentage']:.2f}"
+            self.stdout.write(f"{row['horizon']:>8} {row['observations']:>13} {mae:>10} {mape:>9}")
@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from app.core.bulk_ingestion import ingest_symbols
+
+class Command(BaseCommand):
+    help = "Fetch or refresh the daily prices of many symbols concurrently, within the Alpha Vantage quota."
+
+    def add_arguments(self, parser):
+        parser.add_argument('symbols', nargs='*', help="Symbols to ingest, e.g. AAPL MSFT")
+        parser.add_argument('--file', help="Read symbols from a file, one per line")
+        parser.add_argument('--requests-per-minute', type=int, default=settings.ALPHA_VANTAGE_REQUESTS_PER_MINUTE)
+        parser.add_argument('--concurrency', type=int, default=settings.INGESTION_CONCURRENCY)
+        parser.add_argument('--no-predict', action='store_true', help="Skip the prediction batch for updated symbols")
+
+    def handle(self, *args, **options):
+        symbols = list(options['symbols'])
+        if options['file']:
+            with open(options['file']) as f:
+                symbols.extend(line.strip() for line in f if line.strip())
+        symbols = list(dict.fromkeys(symbols))
+        invalid = [symbol for symbol in symbols if not symbol.isalpha() or len(symbol) > 10]
+        if invalid:
+            raise CommandError(f"Invalid stock symbols: {', '.join(invalid)}")
+        if not symbols:
+            raise CommandError("No symbols given.")
+
+        def report(progress):
+            last = progress['last']
+            detail = f"{last['inserted']} new bars" if last['status'] == 'succeeded' else last['error']
+            self.stdout.write(f"[{progress['completed']}/{progress['total']}] {last['symbol']}: {last['status']} ({detail})")
+
+        summary = ingest_symbols(
+            symbols,
+            requests_per_minute=options['requests_per_minute'],
+            concurrency=options['concurrency'],
+            on_progress=report,
+            predict=False if options['no_predict'] else None,
+        )
+        style = self.style.SUCCESS if not summary['failed'] else self.style.WARNING
+        self.stdout.write(style(
+            f"Ingested {summary['succeeded']}/{summary['total']} symbols in {summary['elapsed_seconds']}s "
+            f"({summary['failed']} failed)"
+        ))
+        if summary.get('predictions'):
+            self.stdout.write(f"Precomputed {summary['predictions']['predictions']} predictions for "
+                              f"{summary['predictions']['symbols']} symbols")
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from app.core.prediction_batch import run_prediction_batch, PREDICTION_DAYS
+from app.core.evaluation import backfill_actual_prices
+
+class Command(BaseCommand):
+    help = "Backfill realized prices, then forecast every stored symbol in one batch, store the predictions and warm the prediction cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument('symbols', nargs='*', help="Limit the batch to these symbols (default: all)")
+        parser.add_argument('--days', type=int, default=PREDICTION_DAYS)
+        parser.add_argument('--no-warm-cache', action='store_true')
+        parser.add_argument('--no-backfill', action='store_true', help="Skip filling in realized prices of past predictions")
+
+    def handle(self, *args, **options):
+        if not options['no_backfill']:
+            updated = backfill_actual_prices(symbols=options['symbols'] or None)
+            self.stdout.write(f"Backfilled actual prices for {updated} predictions")
+
+        summary = run_prediction_batch(
+            symbols=options['symbols'] or None,
+            days=options['days'],
+            warm_cache=not options['no_warm_cache'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {summary['predictions']} predictions for {summary['symbols']} symbols in {summary['elapsed_seconds']}s"
+        ))
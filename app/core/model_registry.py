@@ -0,0 +1,113 @@
+import os
+import time
+import logging
+import threading
+from collections import namedtuple
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_Entry = namedtuple('_Entry', ['model', 'stamp', 'checked_at'])
+
+class ModelNotFound(Exception):
+    pass
+
+def _file_stamp(path):
+    """What identifies one version of a file: a replaced or rewritten file changes inode, mtime or size."""
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+class ModelRegistry:
+    """
+    Prediction models by version, loaded on first use.
+
+    Versions are <version>.pkl files in settings.MODEL_DIR. Models are loaded
+    with joblib.load(mmap_mode='r'), so their arrays are memory-mapped and
+    shared through the page cache by every worker process. A loaded model's
+    file is checked at most every MODEL_RELOAD_INTERVAL seconds; when it has
+    changed, the new model is loaded completely before it replaces the old
+    one, so callers get either version and never a partial one. Publish a new
+    model by writing it next to the old file and renaming it over it; never
+    rewrite a model file in place, since loaded models map its pages.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def path(self, version):
+        return os.path.join(settings.MODEL_DIR, f"{version}.pkl")
+
+    def versions(self):
+        """Versions available in MODEL_DIR."""
+        return sorted(name[:-len('.pkl')] for name in os.listdir(settings.MODEL_DIR) if name.endswith('.pkl'))
+
+    def version_for(self, symbol):
+        return settings.SYMBOL_MODEL_VERSIONS.get(symbol, settings.MODEL_VERSION)
+
+    def get(self, version=None):
+        """The model of a version (default: settings.MODEL_VERSION), loading or reloading it if needed."""
+        return self.get_with_revision(version)[0]
+
+    def get_with_revision(self, version=None):
+        """
+        (model, revision) of a version. The revision names the loaded file, e.g.
+        'model@1729238400000000000-1024', and changes whenever a reload replaces it,
+        so results of the model can be tagged with it.
+        """
+        version = version or settings.MODEL_VERSION
+        entry = self._entries.get(version)
+        if entry is None or time.monotonic() - entry.checked_at >= settings.MODEL_RELOAD_INTERVAL:
+            with self._lock:
+                now = time.monotonic()
+                entry = self._entries.get(version)
+                if entry is None or now - entry.checked_at >= settings.MODEL_RELOAD_INTERVAL:
+                    entry = self._refresh(version, entry, now)
+        _, mtime_ns, size = entry.stamp
+        return entry.model, f"{version}@{mtime_ns}-{size}"
+
+    def for_symbol(self, symbol):
+        """The model selected for a symbol through settings.SYMBOL_MODEL_VERSIONS."""
+        return self.get(self.version_for(symbol))
+
+    def revision_for(self, symbol):
+        """The revision of the model selected for a symbol."""
+        return self.get_with_revision(self.version_for(symbol))[1]
+
+    def _refresh(self, version, entry, now):
+        path = self.path(version)
+        try:
+            stamp = _file_stamp(path)
+        except FileNotFoundError:
+            if entry is None:
+                raise ModelNotFound(f"No model file for version {version}: {path}")
+            logger.error(f"Model file for version {version} disappeared, keeping the loaded model")
+            self._entries[version] = entry._replace(checked_at=now)
+            return self._entries[version]
+
+        if entry is not None and entry.stamp == stamp:
+            self._entries[version] = entry._replace(checked_at=now)
+            return self._entries[version]
+
+        started = time.perf_counter()
+        try:
+            model = self._load(path)
+        except Exception as e:
+            if entry is None:
+                raise
+            # E.g. a corrupt upload; keep serving the old model and try again after the next interval.
+            logger.error(f"Failed to reload model version {version}, keeping the loaded model: {str(e)}")
+            self._entries[version] = entry._replace(checked_at=now)
+            return self._entries[version]
+
+        self._entries[version] = _Entry(model, stamp, now)
+        logger.info(f"{'Reloaded' if entry else 'Loaded'} model version {version} "
+                    f"in {time.perf_counter() - started:.3f}s")
+        return self._entries[version]
+
+    def _load(self, path):
+        # joblib (and the estimator's library, while unpickling) is imported on first use, not at startup.
+        import joblib
+        return joblib.load(path, mmap_mode='r')
+
+registry = ModelRegistry()
@@ -25,6 +25,13 @@ class StockPrediction(models.Model):
     actual_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     predicted_price = models.DecimalField(max_digits=10, decimal_places=2)
     prediction_date = models.DateField()
+    # Revision of the model that produced the forecast (see ModelRegistry.get_with_revision).
+    model_version = models.CharField(max_length=100, blank=True, default='')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['symbol', 'prediction_date'], name='unique_stock_prediction')
+        ]
 
     def __str__(self):
         return f"Prediction for {self.symbol} on {self.prediction_date}: {self.predicted_price}"
@@ -0,0 +1,117 @@
+import logging
+import numpy as np
+import pandas as pd
+from .backtesting import SHORT_WINDOW, LONG_WINDOW, BACKTEST_INDICATORS
+from .series_store import get_series
+
+logger = logging.getLogger(__name__)
+
+PORTFOLIO_COLUMNS = ('timestamp', 'close', *BACKTEST_INDICATORS)
+
+def align_series(series):
+    """
+    Align per-symbol arrays on the union of their timestamps.
+
+    `series` maps symbol -> {'timestamp': int64 ns, column: values, ...}. Returns
+    (timestamps, symbols, {column: float64 matrix of dates x symbols}) where a
+    symbol's cells are NaN on dates it has no bar.
+    """
+    symbols = list(series)
+    timestamps = np.unique(np.concatenate([np.asarray(series[symbol]['timestamp']) for symbol in symbols]))
+    columns = [column for column in series[symbols[0]] if column != 'timestamp']
+
+    matrices = {column: np.full((len(timestamps), len(symbols)), np.nan) for column in columns}
+    for j, symbol in enumerate(symbols):
+        rows = np.searchsorted(timestamps, series[symbol]['timestamp'])
+        for column in columns:
+            matrices[column][rows, j] = series[symbol][column]
+    return timestamps, symbols, matrices
+
+def load_portfolio(symbols):
+    """
+    Load and align the close prices and stored crossover averages of several symbols.
+
+    The crossover averages (BACKTEST_INDICATORS) come from the series store,
+    computed on each symbol's own bars, so gaps in the aligned matrix do not
+    shift the windows.
+    Returns (timestamps, symbols found, matrices), or None when no symbol has prices.
+    """
+    series = {}
+    for symbol in symbols:
+        stored = get_series(symbol, columns=PORTFOLIO_COLUMNS)
+        if stored is not None and len(stored['timestamp']):
+            series[symbol] = stored
+    if not series:
+        return None
+    return align_series(series)
+
+def crossover_positions(close, ma_short, ma_long):
+    """
+    Resolve the all-in/all-out crossover state machine of every column at once.
+
+    Same rules as crossover_trades: a flat column goes long on a bar where
+    close < ma_short, a long one goes flat on a bar where close > ma_long, and
+    bars with a NaN never trade. The state is carried date by date as one
+    vector over all symbols. Returns a bool matrix, True where a column is long.
+    """
+    valid = ~(np.isnan(close) | np.isnan(ma_short) | np.isnan(ma_long))
+    with np.errstate(invalid='ignore'):
+        buy = valid & (close < ma_short)
+        sell = valid & (close > ma_long)
+
+    positions = np.empty(close.shape, dtype=bool)
+    position = np.zeros(close.shape[1], dtype=bool)
+    for t in range(close.shape[0]):
+        position = np.where(position, ~sell[t], buy[t])
+        positions[t] = position
+    return positions
+
+def run_portfolio_backtest(close, initial_investment, ma_short=None, ma_long=None,
+                           short_window=SHORT_WINDOW, long_window=LONG_WINDOW):
+    """
+    Backtest the crossover strategy on a dates x symbols close matrix in one pass.
+
+    The investment is split equally between the symbols, each sleeve trading
+    its own symbol all-in/all-out. Sleeves are marked to market every date
+    (a missing bar keeps the last close), so the equity curve and drawdown
+    cover open positions too. Averages are computed column-wise unless given,
+    e.g. from load_portfolio.
+
+    Returns a dict of portfolio metrics, per-symbol arrays (number_of_trades,
+    final_value) and the equity curve.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    if ma_short is None or ma_long is None:
+        frame = pd.DataFrame(close)
+        ma_short = frame.rolling(window=short_window).mean().to_numpy()
+        ma_long = frame.rolling(window=long_window).mean().to_numpy()
+
+    positions = crossover_positions(close, ma_short, ma_long)
+    held = np.zeros_like(positions)
+    held[1:] = positions[:-1]
+
+    # Growth of each sleeve between consecutive dates: the price ratio while held, 1 while in cash.
+    marked = pd.DataFrame(close).ffill().to_numpy()
+    growth = np.ones_like(marked)
+    growth[1:] = marked[1:] / marked[:-1]
+    growth = np.where(held & ~np.isnan(growth), growth, 1.0)
+
+    sleeve = float(initial_investment) / close.shape[1]
+    values = sleeve * np.cumprod(growth, axis=0)
+    equity = values.sum(axis=1)
+    drawdown = 1 - equity / np.maximum.accumulate(equity)
+
+    entries = positions & ~held
+    exits = ~positions & held
+    trades = entries.sum(axis=0) + exits.sum(axis=0)
+
+    return {
+        'total_return_percentage': round(float((equity[-1] / float(initial_investment) - 1) * 100), 2),
+        'max_drawdown_percentage': round(float(drawdown.max() * 100), 2),
+        'number_of_trades': int(trades.sum()),
+        'final_value': round(float(equity[-1]), 2),
+        'open_positions': int(positions[-1].sum()),
+        'symbol_trades': trades,
+        'symbol_values': values[-1],
+        'equity': equity,
+    }
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+NS_PER_DAY = 86_400 * 10**9
+
+def linear_coefficients(model):
+    """Return (slope, intercept) for a fitted single-feature linear model, or None."""
+    coef = getattr(model, 'coef_', None)
+    intercept = getattr(model, 'intercept_', None)
+    if coef is None or intercept is None or np.size(coef) != 1:
+        return None
+    return float(np.ravel(coef)[0]), float(np.ravel(intercept)[0])
+
+def recursive_horizon(slope, intercept, last_values, days):
+    """
+    Closed form of feeding a linear model its own output `days` times.
+
+    x_k = slope**k * x_0 + intercept * (1 + slope + ... + slope**(k-1)), evaluated
+    for every starting value at once. Returns an array of shape (len(last_values), days).
+    """
+    powers = slope ** np.arange(1, days + 1, dtype=np.float64)
+    geometric = np.concatenate(([0.0], np.cumsum(powers[:-1]))) + 1.0
+    return np.outer(np.asarray(last_values, dtype=np.float64), powers) + intercept * geometric
+
+def forecast(model, last_values, days=30):
+    """
+    Recursive multi-step forecast for many series at once.
+
+    Linear models are evaluated analytically from their coefficients; any other
+    estimator is called once per step on the stacked column of current values.
+    """
+    last_values = np.asarray(last_values, dtype=np.float64)
+    coefficients = linear_coefficients(model)
+    if coefficients is not None:
+        return recursive_horizon(*coefficients, last_values, days)
+
+    horizon = np.empty((len(last_values), days))
+    current = last_values.reshape(-1, 1)
+    for step in range(days):
+        current = np.asarray(model.predict(current), dtype=np.float64).reshape(-1, 1)
+        horizon[:, step] = current[:, 0]
+    return horizon
+
+def prediction_frame(predictions, start, days):
+    return pd.DataFrame({
+        'predicted_price': predictions,
+        'date': pd.date_range(start=start, periods=days)
+    })
+
+def predict_many(model, last_closes, days=30):
+    """Forecast every symbol in a {symbol: last_close} mapping, returning {symbol: DataFrame}."""
+    symbols = list(last_closes)
+    horizon = forecast(model, [float(last_closes[symbol]) for symbol in symbols], days)
+    start = pd.Timestamp.now()
+    return {symbol: prediction_frame(horizon[i], start, days) for i, symbol in enumerate(symbols)}
+
+def bar_days(timestamps):
+    """Days since the epoch (UTC) of nanosecond bar timestamps."""
+    return np.asarray(timestamps, dtype=np.int64) // NS_PER_DAY
+
+def match_days(bar_days, targets):
+    """Index of the bar on each target day, and whether there is one (weekends and holidays have none)."""
+    index = np.minimum(np.searchsorted(bar_days, targets), len(bar_days) - 1)
+    return index, bar_days[index] == targets
+
+def walk_forward_errors(model, timestamps, close, days=30, step=1):
+    """
+    Rolling-origin errors of the recursive forecast on one symbol's bars.
+
+    Every `step`-th bar is an origin: the forecast from its close for the next
+    `days` calendar days (the horizon) is compared with the closes of the bars
+    on those days. All origins are forecast in one call. Returns per-horizon
+    arrays of summed absolute and relative errors and observation counts, so
+    results of several symbols can simply be added.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    bar_day = bar_days(timestamps)
+    origins = np.arange(0, len(close) - 1, step)
+    totals = {'origins': len(origins), 'count': np.zeros(days, dtype=np.int64),
+              'abs_error': np.zeros(days), 'pct_error': np.zeros(days)}
+    if not len(origins):
+        return totals
+
+    predicted = forecast(model, close[origins], days)
+    targets = bar_day[origins][:, None] + np.arange(1, days + 1)
+    index, matched = match_days(bar_day, targets)
+    actual = np.where(matched, close[index], np.nan)
+
+    abs_error = np.abs(predicted - actual)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct_error = abs_error / np.abs(actual)
+    totals['count'] = matched.sum(axis=0)
+    totals['abs_error'] = np.nansum(abs_error, axis=0)
+    totals['pct_error'] = np.nansum(np.where(np.isfinite(pct_error), pct_error, np.nan), axis=0)
+    return totals
@@ -0,0 +1,51 @@
+import time
+import logging
+from .models import StockPrice
+from .series_store import get_series
+from .services import predict_many_stock_prices, store_prediction_frames
+from .caching import prime_cache, versioned_key
+from app.api.serializers import PredictionSerializer
+
+logger = logging.getLogger(__name__)
+
+PREDICTION_DAYS = 30
+
+def universe():
+    """Every symbol with stored prices."""
+    return list(StockPrice.objects.values_list('symbol', flat=True).distinct().order_by('symbol'))
+
+def latest_closes(symbols):
+    """Last close of each symbol from the series store, skipping symbols without prices."""
+    closes = {}
+    for symbol in symbols:
+        series = get_series(symbol, columns=('close',))
+        if series is not None and len(series['close']):
+            closes[symbol] = float(series['close'][-1])
+    return closes
+
+def run_prediction_batch(symbols=None, days=PREDICTION_DAYS, warm_cache=True):
+    """
+    Forecast every symbol (default: the whole universe) in one vectorized call.
+
+    The forecasts are upserted into StockPrediction in bulk. With warm_cache,
+    each symbol's prediction response is cached too, so the first request of
+    the day is already a cache hit.
+    """
+    started = time.perf_counter()
+    closes = latest_closes(universe() if symbols is None else symbols)
+    frames = predict_many_stock_prices(closes, days) if closes else {}
+    rows = store_prediction_frames(frames)
+
+    if warm_cache:
+        for symbol, symbol_rows in rows.items():
+            revision = symbol_rows[0].model_version
+            prime_cache(versioned_key('prediction', symbol, revision), PredictionSerializer(symbol_rows, many=True).data)
+
+    summary = {
+        'symbols': len(rows),
+        'predictions': sum(len(symbol_rows) for symbol_rows in rows.values()),
+        'elapsed_seconds': round(time.perf_counter() - started, 4),
+    }
+    logger.info(f"Prediction batch wrote {summary['predictions']} predictions for {summary['symbols']} symbols "
+                f"in {summary['elapsed_seconds']}s")
+    return summary
@@ -0,0 +1,52 @@
+import os
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+MAX_PROCESS_WORKERS = os.cpu_count() or 1
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def shared_pool(max_workers=MAX_PROCESS_WORKERS):
+    """
+    The long-lived process pool of a given size, created on first use.
+
+    Workers are spawned rather than forked, so they do not inherit the web
+    process's threads (cache listener and flusher) or their locks. Functions
+    run on the pool must live in modules that do not import Django models,
+    since workers never call django.setup().
+    """
+    with _pools_lock:
+        pool = _pools.get(max_workers)
+        if pool is None:
+            pool = _pools[max_workers] = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')
+            )
+        return pool
+
+def _discard_pool(max_workers, pool):
+    with _pools_lock:
+        if _pools.get(max_workers) is pool:
+            del _pools[max_workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def pool_map(function, *iterables, max_workers=MAX_PROCESS_WORKERS, chunksize=1):
+    """
+    list(map(function, *iterables)) on the shared pool.
+
+    If the pool has broken, e.g. a worker was killed, it is discarded so the
+    next call starts a fresh one, and this call runs in process instead.
+    """
+    iterables = [list(iterable) for iterable in iterables]
+    pool = shared_pool(max_workers)
+    try:
+        return list(pool.map(function, *iterables, chunksize=chunksize))
+    except BrokenProcessPool:
+        logger.warning(f"Process pool broke running {function.__name__}; restarting it and running in process")
+        _discard_pool(max_workers, pool)
+        return list(map(function, *iterables))
@@ -0,0 +1,159 @@
+import time
+import logging
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from django.db import close_old_connections
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from .models import StockPrice, StockPrediction
+from .series_store import get_series
+from .services import fetch_stock_data, backtest_strategy, BACKTEST_INDICATORS, predict_stock_prices, store_predictions, load_price_frame
+from .utils import fetch_from_api, fetch_stock_data_from_api, fetch_stock_prediction_from_api, fetch_backtest_data_from_api
+from app.api.serializers import PredictionSerializer
+
+logger = logging.getLogger(__name__)
+
+REPORT_STAGES = ['historical_data', 'predictions', 'backtest']
+# Reports read the price history as columns: int64 ns timestamps, float64 prices, int64 volume.
+HISTORY_COLUMNS = ('timestamp', 'open', 'close', 'high', 'low', 'volume')
+DEFAULT_STAGE_TIMEOUT = 30
+
+_gather_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'REPORT_GATHER_WORKERS', 8), thread_name_prefix='report-gather'
+)
+
+class ReportStageTimeout(Exception):
+    pass
+
+class ReportDataProvider(ABC):
+    """
+    Source of the historical data, predictions and backtest results a report is built from.
+
+    historical_data returns {column: array} for HISTORY_COLUMNS, like get_series, or None.
+    """
+
+    @abstractmethod
+    def ensure_data(self, symbol):
+        """Make sure prices are stored for the symbol, since the other stages depend on them."""
+
+    @abstractmethod
+    def historical_data(self, symbol):
+        pass
+
+    @abstractmethod
+    def predictions(self, symbol):
+        pass
+
+    @abstractmethod
+    def backtest(self, symbol, initial_investment):
+        pass
+
+class LocalReportDataProvider(ReportDataProvider):
+    """Calls the service layer and the ORM directly, inside the current process."""
+
+    def ensure_data(self, symbol):
+        if not StockPrice.objects.filter(symbol=symbol).exists():
+            logger.info(f"Fetching stock data in-process for symbol: {symbol}")
+            fetch_stock_data(symbol)
+
+    def historical_data(self, symbol):
+        return get_series(symbol, columns=HISTORY_COLUMNS)
+
+    def predictions(self, symbol):
+        stock_prediction = StockPrediction.objects.filter(symbol=symbol).order_by('prediction_date')
+        if stock_prediction.exists():
+            logger.info(f"Stock prediction found in the database for symbol: {symbol}")
+            return PredictionSerializer(stock_prediction, many=True).data
+
+        df = load_price_frame(symbol)
+        if df is None:
+            return []
+        logger.info(f"Generating predictions in-process for symbol: {symbol}")
+        rows = store_predictions(symbol, predict_stock_prices(df, symbol=symbol))
+        return PredictionSerializer(rows, many=True).data
+
+    def backtest(self, symbol, initial_investment):
+        df = load_price_frame(symbol, indicators=BACKTEST_INDICATORS)
+        if df is None:
+            return {}
+        results = backtest_strategy(df, Decimal(str(initial_investment)))
+        # Match the JSON types the HTTP endpoint returns so results can be stored in a JSONField.
+        return {key: value if key == 'number_of_trades' else float(value) for key, value in results.items()}
+
+class RemoteReportDataProvider(ReportDataProvider):
+    """Goes through the public HTTP API at settings.API_BASE_URL, e.g. when reports run on another host."""
+
+    def ensure_data(self, symbol):
+        fetch_from_api(f"/stock-prices/fetch/{symbol}/", method="POST")
+
+    def historical_data(self, symbol):
+        return history_columns(fetch_stock_data_from_api(symbol))
+
+    def predictions(self, symbol):
+        return fetch_stock_prediction_from_api(symbol)
+
+    def backtest(self, symbol, initial_investment):
+        return fetch_backtest_data_from_api(symbol, initial_investment)
+
+def history_columns(rows):
+    """The HISTORY_COLUMNS arrays of price rows in the API's JSON shape."""
+    columns = {'timestamp': pd.to_datetime([row['timestamp'] for row in rows], utc=True).as_unit('ns').asi8}
+    for name in HISTORY_COLUMNS[1:]:
+        columns[name] = np.array(pd.to_numeric([row[name] for row in rows]), dtype=np.int64 if name == 'volume' else np.float64)
+    return columns
+
+REPORT_DATA_PROVIDERS = {
+    'local': LocalReportDataProvider,
+    'remote': RemoteReportDataProvider,
+}
+
+def get_report_data_provider(mode=None):
+    mode = mode or getattr(settings, 'REPORT_DATA_MODE', None) or 'local'
+    try:
+        return REPORT_DATA_PROVIDERS[mode]()
+    except KeyError:
+        raise ValueError(f"Unknown report data mode: {mode}")
+
+def _run_stage(stage, func, *args):
+    close_old_connections()
+    started = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        logger.info(f"Report stage '{stage}' for {args[0]} took {time.perf_counter() - started:.3f}s")
+        close_old_connections()
+
+def gather_report_inputs(provider, symbol, initial_investment, timeouts=None):
+    """
+    Compute historical data, predictions and the backtest for a report concurrently.
+
+    Prices are ensured first because the other stages read them; the three
+    stages then run on a bounded thread pool, each with its own timeout, so the
+    report waits for the slowest stage instead of the sum of all three.
+    Returns a {stage: result} dict or raises ReportStageTimeout.
+    """
+    timeouts = {**getattr(settings, 'REPORT_STAGE_TIMEOUTS', {}), **(timeouts or {})}
+    started = time.perf_counter()
+    provider.ensure_data(symbol)
+
+    futures = {
+        'historical_data': _gather_executor.submit(_run_stage, 'historical_data', provider.historical_data, symbol),
+        'predictions': _gather_executor.submit(_run_stage, 'predictions', provider.predictions, symbol),
+        'backtest': _gather_executor.submit(_run_stage, 'backtest', provider.backtest, symbol, initial_investment),
+    }
+    submitted = time.perf_counter()
+
+    results = {}
+    for stage in REPORT_STAGES:
+        remaining = timeouts.get(stage, DEFAULT_STAGE_TIMEOUT) - (time.perf_counter() - submitted)
+        try:
+            results[stage] = futures[stage].result(timeout=max(remaining, 0))
+        except FutureTimeoutError:
+            for future in futures.values():
+                future.cancel()
+            raise ReportStageTimeout(f"Report stage '{stage}' for {symbol} timed out")
+
+    logger.info(f"Gathered report inputs for {symbol} in {time.perf_counter() - started:.3f}s")
+    return results
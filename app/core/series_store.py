@@ -0,0 +1,181 @@
+import os
+import json
+import uuid
+import fcntl
+import logging
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from .models import StockPrice
+from .indicators import INDICATOR_NAMES, compute_indicators, update_indicators
+
+logger = logging.getLogger(__name__)
+
+SERIES_COLUMNS = {
+    'timestamp': np.int64,  # nanoseconds since the epoch, UTC
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+    'volume': np.int64,
+}
+STORED_COLUMNS = list(SERIES_COLUMNS) + INDICATOR_NAMES
+
+def _directory():
+    return settings.PRICE_SERIES_DIR
+
+def _manifest_path(symbol):
+    return os.path.join(_directory(), f"{symbol}.json")
+
+def _column_path(symbol, generation, column):
+    return os.path.join(_directory(), f"{symbol}.{generation}.{column}.npy")
+
+@contextmanager
+def _symbol_lock(symbol):
+    # Serializes refreshes of one symbol across processes so a writer never unlinks a generation another is publishing.
+    os.makedirs(_directory(), exist_ok=True)
+    with open(os.path.join(_directory(), f"{symbol}.lock"), 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def write_series(symbol, columns, indicator_state=None):
+    """
+    Atomically replace the stored arrays of a symbol.
+
+    Every refresh writes a new generation of per-column .npy files and then
+    swaps a small manifest with os.replace, so readers always see one
+    consistent generation. Files of older generations are unlinked; processes
+    that still map them keep their pages until they let go.
+    """
+    directory = _directory()
+    os.makedirs(directory, exist_ok=True)
+    generation = uuid.uuid4().hex[:12]
+
+    for column, values in columns.items():
+        dtype = SERIES_COLUMNS.get(column, np.float64)
+        np.save(_column_path(symbol, generation, column), np.ascontiguousarray(values, dtype=dtype))
+
+    manifest = {
+        'generation': generation,
+        'length': len(columns['timestamp']),
+        'columns': list(columns),
+        'indicator_state': indicator_state,
+    }
+    tmp_path = f"{_manifest_path(symbol)}.{generation}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, _manifest_path(symbol))
+
+    prefix = f"{symbol}."
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and name.endswith('.npy') and name.split('.')[1] != generation:
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+    return manifest
+
+def _price_rows(symbol, after=None):
+    queryset = StockPrice.objects.filter(symbol=symbol)
+    if after is not None:
+        queryset = queryset.filter(timestamp__gt=after)
+    return list(queryset.order_by('timestamp').values_list('timestamp', 'open', 'high', 'low', 'close', 'volume'))
+
+def _price_columns(rows):
+    timestamps, opens, highs, lows, closes, volumes = zip(*rows)
+    return {
+        'timestamp': pd.to_datetime(list(timestamps), utc=True).as_unit('ns').asi8,
+        'open': np.array(opens, dtype=np.float64),
+        'high': np.array(highs, dtype=np.float64),
+        'low': np.array(lows, dtype=np.float64),
+        'close': np.array(closes, dtype=np.float64),
+        'volume': np.array(volumes, dtype=np.int64),
+    }
+
+def _appendable(symbol, manifest):
+    """The stored arrays of a symbol and their last timestamp if new bars can simply be appended, else None."""
+    if manifest is None or set(manifest.get('columns', [])) != set(STORED_COLUMNS) or not manifest['length']:
+        return None
+    stored = _load_generation(symbol, manifest['generation'], STORED_COLUMNS)
+    if stored is None:
+        return None
+    last = pd.Timestamp(int(stored['timestamp'][-1]), tz='UTC').to_pydatetime()
+    # Bars inserted before the last stored one (e.g. a backfill) need a full rebuild.
+    if StockPrice.objects.filter(symbol=symbol, timestamp__lte=last).count() != manifest['length']:
+        return None
+    return stored, last
+
+def refresh_series(symbol):
+    """
+    Bring a symbol's arrays and indicators up to date with StockPrice.
+
+    When only newer bars were added, just those are read and the indicators
+    are extended incrementally; otherwise everything is rebuilt in one query.
+    Symbols without stored prices return None before any file is created.
+    """
+    if _load_manifest(symbol) is None and not StockPrice.objects.filter(symbol=symbol).exists():
+        return None
+    with _symbol_lock(symbol):
+        manifest = _load_manifest(symbol)
+        appendable = _appendable(symbol, manifest)
+
+        if appendable is not None:
+            stored, last = appendable
+            rows = _price_rows(symbol, after=last)
+            if not rows:
+                return manifest
+            new = _price_columns(rows)
+            columns = {name: np.concatenate((stored[name], new[name])) for name in SERIES_COLUMNS}
+            indicators, state = update_indicators(columns, manifest['length'], stored, manifest['indicator_state'])
+        else:
+            rows = _price_rows(symbol)
+            if not rows:
+                return None
+            columns = _price_columns(rows)
+            indicators, state = compute_indicators(columns)
+
+        manifest = write_series(symbol, {**columns, **indicators}, state)
+    logger.info(f"Refreshed series store for {symbol}: {manifest['length']} bars")
+    return manifest
+
+def _load_manifest(symbol):
+    try:
+        with open(_manifest_path(symbol)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def _load_generation(symbol, generation, columns):
+    try:
+        return {column: np.load(_column_path(symbol, generation, column), mmap_mode='r') for column in columns}
+    except FileNotFoundError:
+        return None
+
+def load_series(symbol, columns=('timestamp', 'close')):
+    """
+    Memory-map the stored arrays of a symbol, returning {column: read-only array} or None.
+
+    Loading is zero-copy: the arrays are backed by the page cache, which all
+    worker processes share. Indicators (see INDICATOR_NAMES) are requested
+    like any price column.
+    """
+    for _ in range(2):
+        manifest = _load_manifest(symbol)
+        if manifest is None:
+            return None
+        series = _load_generation(symbol, manifest['generation'], columns)
+        if series is not None:
+            return series
+        # A refresh replaced this generation mid-read; look again once.
+    return None
+
+def get_series(symbol, columns=('timestamp', 'close')):
+    """Load a symbol's arrays, building them from the database on first use."""
+    series = load_series(symbol, columns)
+    if series is None and refresh_series(symbol) is not None:
+        series = load_series(symbol, columns)
+    return series
@@ -1,112 +1,184 @@
 import httpx
 import pandas as pd
-from .utils import load_model
-import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
 from django.conf import settings
-from .models import StockPrice
-from app.api.serializers import StockPriceSerializer
+from django.db import transaction
+from .models import StockPrediction
+from .ingestion import DailySeriesParser, bulk_ingest, latest_timestamp
+from .series_store import get_series
+from .backtesting import run_backtest, BACKTEST_INDICATORS
+from .prediction import forecast, prediction_frame, predict_many
+from .model_registry import registry
 import logging
 
 logger = logging.getLogger(__name__)
 
-MODEL_PATH = 'app/core/ml/model.pkl'
-model = load_model(MODEL_PATH)
+HISTORY_DAYS = 2 * 365
+# outputsize=compact returns the latest 100 trading days, which covers any gap shorter than 100 calendar days.
+COMPACT_MAX_GAP_DAYS = 100
 
-def fetch_stock_data(symbol):
+def request_daily_series(symbol, outputsize='full', since=None):
+    """
+    Download a symbol's daily bars on or after `since` from Alpha Vantage as a typed frame.
+
+    The body is parsed as it streams in and the download is cut short at the
+    first bar older than `since`, so the full 20-year payload is never held in memory.
+    Raises SymbolNotFound or RateLimited when Alpha Vantage sends no bars.
+    """
     API_KEY = settings.ALPHA_VANTAGE_API_KEY
-    url = f'https://www.alphavantage.co/query?function=TIME_SERIES_DAILY&symbol={symbol}&apikey={API_KEY}&outputsize=full'
+    url = f'{settings.ALPHA_VANTAGE_BASE_URL}/query?function=TIME_SERIES_DAILY&symbol={symbol}&apikey={API_KEY}&outputsize={outputsize}'
 
-    logger.info(f"Fetching stock data for symbol: {symbol}")
-    
+    parser = DailySeriesParser(since)
     with httpx.Client() as client:
-        try:
-            response = client.get(url)
+        with client.stream('GET', url) as response:
+            if response.is_error:
+                response.read()
             response.raise_for_status()
-            data = response.json()
-            time_series = data.get('Time Series (Daily)', {})
-            
-            two_years_ago = datetime.now() - timedelta(days=2 * 365)
-            for date, stats in time_series.items():
-                stock_date = datetime.strptime(date, '%Y-%m-%d')
-                if stock_date >= two_years_ago:
-                    if StockPrice.objects.filter(symbol=symbol, timestamp=stock_date).exists():
-                        logger.info(f"Stock data for {symbol} on {date} already exists in the database. Skipping.")
-                        continue
-                    stock_price_data = {
-                        'symbol': symbol,
-                        'timestamp': stock_date,
-                        'open': stats['1. open'],
-                        'close': stats['4. close'],
-                        'high': stats['2. high'],
-                        'low': stats['3. low'],
-                        'volume': stats['5. volume'],
-                    }
-
-                    serializer = StockPriceSerializer(data=stock_price_data)
-                    if serializer.is_valid():
-                        serializer.save()
-                        logger.info(f"Stored stock data for {symbol} on {date}")
-                    else:
-                        logger.warning(f"Validation error for {symbol} on {date}: {serializer.errors}")
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Error fetching data for {symbol}: {e.response.status_code} - {e.response.text}")
-        except Exception as e:
-            logger.error(f"Unexpected error fetching data for {symbol}: {str(e)}")   
-            
-def calculate_moving_averages(prices):
-    prices['50_MA'] = prices['close'].rolling(window=50).mean()
-    prices['200_MA'] = prices['close'].rolling(window=200).mean()
+            for chunk in response.iter_bytes():
+                if parser.feed(chunk):
+                    break
+    parser.check()
+    return parser.frame()
+
+def fetch_stock_data(symbol):
+    logger.info(f"Fetching stock data for symbol: {symbol}")
     
-    return prices
+    try:
+        two_years_ago = datetime.now() - timedelta(days=HISTORY_DAYS)
+        frame = request_daily_series(symbol, 'full', since=two_years_ago)
+        return bulk_ingest(symbol, frame)
+    except httpx.HTTPStatusError as e:
+        logger.error(f"Error fetching data for {symbol}: {e.response.status_code} - {e.response.text}")
+    except Exception as e:
+        logger.error(f"Unexpected error fetching data for {symbol}: {str(e)}")   
 
-def backtest_strategy(prices, initial_investment):
-    cash = initial_investment
-    shares = 0
-    total_return = 0
-    max_drawdown = 0
-    max_value = initial_investment
-    trades = 0
-
-    prices = calculate_moving_averages(prices)
-
-    for _, row in prices.iterrows():
-        close_price = row['close']
-        moving_average_50 = row['50_MA']
-        moving_average_200 = row['200_MA']
-
-        if pd.notna(close_price) and pd.notna(moving_average_50) and pd.notna(moving_average_200):
-            if close_price < moving_average_50 and shares == 0:  # Buy stock
-                shares = cash / close_price
-                cash = 0
-                trades += 1
-            elif close_price > moving_average_200 and shares > 0:  # Sell stock
-                cash = shares * close_price
-                shares = 0
-                trades += 1
-
-                portfolio_value = cash
-                total_return = (portfolio_value - initial_investment) / initial_investment * 100
-                max_value = max(max_value, portfolio_value)
-                drawdown = (max_value - portfolio_value) / max_value * 100
-                max_drawdown = max(max_drawdown, drawdown)
+def refresh_plan(symbol):
+    """
+    Decide how to bring a symbol up to date: returns (outputsize, since, high_water_mark).
+
+    Gaps shorter than COMPACT_MAX_GAP_DAYS only need the compact series; a
+    symbol with no data or an older high-water mark gets the full two-year load.
+    """
+    high_water_mark = latest_timestamp(symbol)
+    now = datetime.now(dt_timezone.utc)
+    two_years_ago = now - timedelta(days=HISTORY_DAYS)
 
+    if high_water_mark is None:
+        return 'full', two_years_ago, None
+    since = high_water_mark + timedelta(seconds=1)
+    if now - high_water_mark < timedelta(days=COMPACT_MAX_GAP_DAYS):
+        return 'compact', since, high_water_mark
+    return 'full', max(two_years_ago, since), high_water_mark
+
+def ingest_price_frame(symbol, frame, outputsize, high_water_mark):
+    """Store the bars of a downloaded price frame and describe the refresh."""
+    result = bulk_ingest(symbol, frame)
     return {
-        'total_return_percentage': round(total_return, 2),
-        'max_drawdown_percentage': round(max_drawdown, 2),
-        'number_of_trades': trades,
-        'final_cash': round(cash, 2)
+        **result,
+        'outputsize': outputsize,
+        'previous_high_water_mark': high_water_mark,
+        'high_water_mark': latest_timestamp(symbol) if result['inserted'] else high_water_mark,
     }
+
+def refresh_stock_data(symbol, predict=None):
+    """
+    Append the bars newer than a symbol's high-water mark. Errors propagate to the caller.
+
+    As after bulk ingestion, new bars are followed by a prediction batch for the
+    symbol unless `predict` (default settings.PREDICT_AFTER_INGESTION) is off.
+    """
+    outputsize, since, high_water_mark = refresh_plan(symbol)
+    logger.info(f"Refreshing stock data for {symbol} from {high_water_mark} using outputsize={outputsize}")
+    result = ingest_price_frame(symbol, request_daily_series(symbol, outputsize, since), outputsize, high_water_mark)
+    if predict is None:
+        predict = settings.PREDICT_AFTER_INGESTION
+    if predict and result['inserted']:
+        # prediction_batch imports this module.
+        from .prediction_batch import run_prediction_batch
+        result['predictions'] = run_prediction_batch([symbol])
+    return result
+
+def load_price_frame(symbol, indicators=()):
+    """
+    Load a symbol's close history ordered by timestamp, or None when nothing is stored.
+
+    The columns wrap the memory-mapped float64 arrays of the series store
+    without copying them; precomputed indicators such as 'sma_50' can be
+    added next to 'close'.
+    """
+    series = get_series(symbol, columns=('timestamp', 'close', *indicators))
+    if series is None:
+        return None
+    index = pd.DatetimeIndex(pd.to_datetime(series['timestamp'], utc=True), name='timestamp')
+    return pd.DataFrame({name: series[name] for name in ('close', *indicators)}, index=index, copy=False)
+
+def backtest_strategy(prices, initial_investment):
+    """Backtest a price frame, reusing its stored moving averages when load_price_frame added BACKTEST_INDICATORS."""
+    ma_short, ma_long = (prices[name].to_numpy() if name in prices else None for name in BACKTEST_INDICATORS)
+    return run_backtest(prices['close'].to_numpy(), initial_investment, ma_short=ma_short, ma_long=ma_long)
     
-def predict_stock_prices(stock_data, days=30):
-    last_prediction = stock_data['close'].iloc[-1]
-    predictions = []
-    for _ in range(days):
-        next_prediction = model.predict(np.array([[last_prediction]]))[0]
-        predictions.append(next_prediction)
-        last_prediction = next_prediction
-
-    return pd.DataFrame({
-        'predicted_price': predictions,
-        'date': pd.date_range(start=pd.Timestamp.now(), periods=days)
-    })
+def predict_stock_prices(stock_data, days=30, symbol=None):
+    """
+    Forecast from the last close with the model selected for the symbol (default model without one).
+
+    The frame's model_version column holds the revision of the model used.
+    """
+    model, revision = registry.get_with_revision(registry.version_for(symbol) if symbol else None)
+    last_close = float(stock_data['close'].iloc[-1])
+    predictions = forecast(model, [last_close], days)[0]
+    frame = prediction_frame(predictions, pd.Timestamp.now(), days)
+    frame['model_version'] = revision
+    return frame
+
+def predict_many_stock_prices(last_closes, days=30):
+    """Forecast {symbol: last_close} in one call per model version the symbols are assigned to."""
+    by_version = {}
+    for symbol, last_close in last_closes.items():
+        by_version.setdefault(registry.version_for(symbol), {})[symbol] = last_close
+    frames = {}
+    for version, closes in by_version.items():
+        model, revision = registry.get_with_revision(version)
+        for symbol, frame in predict_many(model, closes, days).items():
+            frame['model_version'] = revision
+            frames[symbol] = frame
+    return frames
+
+def store_prediction_frames(frames):
+    """Upsert {symbol: prediction frame} in one statement and return the written rows by symbol."""
+    rows = {
+        symbol: [
+            StockPrediction(symbol=symbol, prediction_date=date.date(), predicted_price=Decimal(f"{price:.2f}"),
+                            model_version=revision)
+            for date, price, revision in zip(predictions['date'], predictions['predicted_price'], predictions['model_version'])
+        ]
+        for symbol, predictions in frames.items()
+    }
+    with transaction.atomic():
+        StockPrediction.objects.bulk_create(
+            [row for symbol_rows in rows.values() for row in symbol_rows],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['symbol', 'prediction_date'],
+            update_fields=['predicted_price', 'model_version'],
+        )
+    return rows
+
+def store_predictions(symbol, predictions):
+    """Upsert a prediction frame for a symbol in one statement and return the written rows."""
+    return store_prediction_frames({symbol: predictions})[symbol]
+
+def precomputed_predictions(symbol, days=30, revision=None):
+    """
+    The stored forecast for today and the next days - 1 days, as written by the
+    daily prediction batch, or None if any of those days is missing or was
+    forecast by another model revision (default: the symbol's current one).
+    """
+    start = pd.Timestamp.now().date()
+    rows = list(
+        StockPrediction.objects.filter(
+            symbol=symbol, prediction_date__gte=start, prediction_date__lt=start + timedelta(days=days),
+            model_version=revision or registry.revision_for(symbol),
+        ).order_by('prediction_date')
+    )
+    return rows if len(rows) == days else None
@@ -0,0 +1,51 @@
+import logging
+from itertools import repeat
+from .backtesting import sweep_close_series
+from .process_pool import pool_map, MAX_PROCESS_WORKERS
+from .series_store import get_series
+
+logger = logging.getLogger(__name__)
+
+MAX_SWEEP_WORKERS = MAX_PROCESS_WORKERS
+# Sweeps smaller than this many bar x window-pair evaluations run in the request's process.
+SWEEP_IN_PROCESS_MAX_WORK = 2_000_000
+SWEEP_METRICS = ['total_return_percentage', 'max_drawdown_percentage', 'number_of_trades', 'final_cash']
+
+def load_close_series(symbols):
+    """Load the close history of several symbols from the series store, as float64 arrays keyed by symbol."""
+    closes = {}
+    for symbol in symbols:
+        series = get_series(symbol, columns=('close',))
+        if series is not None:
+            closes[symbol] = series['close']
+    return closes
+
+def run_sweep(series, short_windows, long_windows, initial_investments, sort_by='total_return_percentage',
+              descending=True):
+    """
+    Run a parameter sweep over preloaded close series and return a ranked results table.
+
+    Large sweeps are spread across the shared process pool, each worker
+    receiving the float64 series it needs so no database access happens
+    outside this process; small ones are cheaper to run here than to ship.
+    """
+    initial_investments = [float(amount) for amount in initial_investments]
+    symbols, closes = list(series), list(series.values())
+    pairs = sum(1 for short_window in short_windows for long_window in long_windows if short_window < long_window)
+    work = pairs * sum(len(close) for close in closes)
+
+    workers = MAX_SWEEP_WORKERS if len(closes) > 1 and work > SWEEP_IN_PROCESS_MAX_WORK else 1
+    if workers > 1:
+        # Workers only import the backtesting module, which needs no Django setup.
+        batches = pool_map(sweep_close_series, closes, repeat(short_windows, len(closes)),
+                           repeat(long_windows, len(closes)), repeat(initial_investments, len(closes)),
+                           max_workers=workers)
+    else:
+        batches = [sweep_close_series(close, short_windows, long_windows, initial_investments) for close in closes]
+
+    results = [{'symbol': symbol, **result} for symbol, batch in zip(symbols, batches) for result in batch]
+    results.sort(key=lambda result: result[sort_by], reverse=descending)
+    results = [{'rank': rank, **result} for rank, result in enumerate(results, start=1)]
+
+    logger.info(f"Sweep evaluated {len(results)} combinations across {len(symbols)} symbols on {workers} workers")
+    return results
@@ -0,0 +1,133 @@
+import time
+import uuid
+import pickle
+import logging
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = 'cache_invalidations'
+
+class LocalLRUCache:
+    """Thread-safe in-process LRU cache bounded by the approximate byte size of its values, with a TTL."""
+
+    def __init__(self, max_bytes, ttl):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, size, expires_at = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, size=None):
+        if size is None:
+            size = len(value) if isinstance(value, (bytes, str)) else len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            self._remove(key)
+            self.entries[key] = (value, size, time.monotonic() + self.ttl)
+            self.size += size
+            while self.size > self.max_bytes:
+                oldest = next(iter(self.entries))
+                self._remove(oldest)
+
+    def delete(self, key):
+        with self.lock:
+            self._remove(key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+class TieredCache:
+    """
+    Short-lived per-process L1 in front of the shared Redis cache.
+
+    Writes and invalidations are announced on a Redis pub/sub channel so every
+    other process drops its L1 copy; the L1 TTL bounds staleness if a message
+    is missed while a subscriber reconnects.
+    """
+
+    def __init__(self, max_bytes, ttl):
+        self.local = LocalLRUCache(max_bytes, ttl)
+        self.origin = uuid.uuid4().hex
+        self.listener = None
+        self.listener_lock = threading.Lock()
+
+    def get(self, key):
+        self._ensure_listener()
+        value = self.local.get(key)
+        if value is not None:
+            return value
+        value = cache.get(key)
+        if value is not None:
+            self.local.set(key, value)
+        return value
+
+    def set(self, key, value, timeout):
+        cache.set(key, value, timeout=timeout)
+        self.local.set(key, value)
+        self._publish(key)
+
+    def invalidate(self, key):
+        self.local.delete(key)
+        self._publish(key)
+
+    def _publish(self, key):
+        try:
+            get_redis_connection('default').publish(INVALIDATION_CHANNEL, f"{self.origin}|{key}")
+        except Exception as e:
+            logger.debug(f"Could not publish invalidation for {key}: {str(e)}")
+
+    def _ensure_listener(self):
+        if self.listener is not None and self.listener.is_alive():
+            return
+        with self.listener_lock:
+            if self.listener is None or not self.listener.is_alive():
+                self.listener = threading.Thread(target=self._listen, name='cache-invalidations', daemon=True)
+                self.listener.start()
+
+    def _listen(self):
+        backoff = 1
+        while True:
+            try:
+                pubsub = get_redis_connection('default').pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Anything published while we were disconnected is lost, so start from an empty L1.
+                self.local.clear()
+                backoff = 1
+                for message in pubsub.listen():
+                    origin, key = message['data'].decode().split('|', 1)
+                    if origin != self.origin:
+                        self.local.delete(key)
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener disconnected: {str(e)}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+tiered_cache = TieredCache(
+    max_bytes=getattr(settings, 'CACHE_L1_MAX_BYTES', 32 * 2 ** 20),
+    ttl=getattr(settings, 'CACHE_L1_TTL', 5),
+)
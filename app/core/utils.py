@@ -1,9 +1,9 @@
-import joblib
 import requests
 import logging
 from django.conf import settings
 from .models import StockPrice, StockPrediction
-from app.api.serializers import StockPriceSerializer, PredictionSerializer
+from app.api.serializers import PredictionSerializer
+from app.api.encoders import price_rows
 
 logger = logging.getLogger(__name__)
 
@@ -25,8 +25,7 @@ def fetch_stock_data_from_api(symbol):
     stock_data = StockPrice.objects.filter(symbol=symbol).order_by('timestamp')
     if stock_data.exists():
         logger.info(f"Stock data found in the database for symbol: {symbol}")
-        stock_data_serialized = StockPriceSerializer(stock_data, many=True)
-        return stock_data_serialized.data
+        return price_rows(stock_data)
     
     logger.info(f"Fetching stock data via API for symbol: {symbol}")
     endpoint = f"/stock-prices/fetch/{symbol}/"
@@ -34,8 +33,7 @@ def fetch_stock_data_from_api(symbol):
 
     stock_data = StockPrice.objects.filter(symbol=symbol).order_by('timestamp')
     if stock_data.exists():
-        stock_data_serialized = StockPriceSerializer(stock_data, many=True)
-        return stock_data_serialized.data
+        return price_rows(stock_data)
     else:
         logger.error(f"Failed to fetch stock data for {symbol}")
         raise Exception(f"Failed to fetch stock data for {symbol}")
@@ -63,7 +61,3 @@ def fetch_backtest_data_from_api(symbol, initial_investment):
     endpoint = "/backtest/"
     data = {'symbol': symbol, 'initial_investment': initial_investment}
     return fetch_from_api(endpoint, data, method="POST")
-
-def load_model(model_path):
-    """Load the pre-trained machine learning model."""
-    return joblib.load(model_path)
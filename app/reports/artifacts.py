@@ -0,0 +1,179 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from django.conf import settings
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+# Part of every artifact key: bump it whenever chart styling or report rendering changes,
+# so artifacts rendered by older code are no longer served.
+ARTIFACT_VERSION = 1
+
+def artifact_key(kind, *parts):
+    """Content address for an artifact: a hash of the renderer version, its kind, input data and render parameters."""
+    digest = hashlib.sha256(f"{ARTIFACT_VERSION}:{kind}".encode())
+    for part in parts:
+        digest.update(b'\0')
+        digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+    return f"{kind}-{digest.hexdigest()}"
+
+class ArtifactStore(ABC):
+    """Byte store for rendered charts and PDFs, bounded in total size with least-recently-used eviction."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+
+    @abstractmethod
+    def get(self, key):
+        """The stored bytes for a key, or None."""
+
+    @abstractmethod
+    def set(self, key, data):
+        """Store bytes under a key, evicting least recently used artifacts beyond max_bytes."""
+
+class FileArtifactStore(ArtifactStore):
+    """Keeps artifacts as files; the modification time is bumped on every read and drives eviction."""
+
+    def __init__(self, directory, max_bytes):
+        super().__init__(max_bytes)
+        self.directory = directory
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            return None
+
+    def set(self, key, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        with self.lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and not entry.name.startswith('.tmp-'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except FileNotFoundError:
+                    pass
+
+class RedisArtifactStore(ArtifactStore):
+    """
+    Keeps artifacts in Redis next to a sorted set of last-access times and a running size total.
+
+    Storing an artifact, updating the total and evicting the least recently
+    used entries run as one Lua script, so concurrent writers cannot make the
+    total drift from the sizes actually stored.
+    """
+
+    DATA_KEY = 'artifacts:data:{}'
+    ACCESS_KEY = 'artifacts:access'
+    SIZES_KEY = 'artifacts:sizes'
+    TOTAL_KEY = 'artifacts:total'
+
+    # KEYS: access, sizes, total. ARGV: data key prefix, artifact key, data, access time, max bytes.
+    SET_SCRIPT = """
+    local prefix, key, data = ARGV[1], ARGV[2], ARGV[3]
+    local previous = tonumber(redis.call('HGET', KEYS[2], key) or 0)
+    redis.call('SET', prefix .. key, data)
+    redis.call('ZADD', KEYS[1], ARGV[4], key)
+    redis.call('HSET', KEYS[2], key, #data)
+    local total = redis.call('INCRBY', KEYS[3], #data - previous)
+    while total > tonumber(ARGV[5]) do
+        local oldest = redis.call('ZPOPMIN', KEYS[1])
+        if #oldest == 0 then
+            break
+        end
+        local size = tonumber(redis.call('HGET', KEYS[2], oldest[1]) or 0)
+        redis.call('DEL', prefix .. oldest[1])
+        redis.call('HDEL', KEYS[2], oldest[1])
+        total = redis.call('INCRBY', KEYS[3], -size)
+    end
+    return total
+    """
+
+    def __init__(self, max_bytes, alias='default'):
+        super().__init__(max_bytes)
+        self.alias = alias
+        self.set_script = None
+
+    def _redis(self):
+        return get_redis_connection(self.alias)
+
+    def get(self, key):
+        redis = self._redis()
+        data = redis.get(self.DATA_KEY.format(key))
+        if data is not None:
+            # XX: never re-add an entry that was evicted since the read.
+            redis.zadd(self.ACCESS_KEY, {key: time.time()}, xx=True)
+        return data
+
+    def set(self, key, data):
+        redis = self._redis()
+        if self.set_script is None:
+            self.set_script = redis.register_script(self.SET_SCRIPT)
+        self.set_script(
+            keys=[self.ACCESS_KEY, self.SIZES_KEY, self.TOTAL_KEY],
+            args=[self.DATA_KEY.format(''), key, data, time.time(), self.max_bytes],
+            client=redis,
+        )
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_artifact_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            max_bytes = getattr(settings, 'REPORT_ARTIFACT_MAX_BYTES', 256 * 2 ** 20)
+            if getattr(settings, 'REPORT_ARTIFACT_STORE', 'redis') == 'file':
+                _store = FileArtifactStore(settings.REPORT_ARTIFACT_DIR, max_bytes)
+            else:
+                _store = RedisArtifactStore(max_bytes)
+        return _store
+
+def cached_artifact(kind, parts, render):
+    """Return the stored bytes for an artifact, rendering and storing them on a miss."""
+    store = get_artifact_store()
+    key = artifact_key(kind, *parts)
+    try:
+        data = store.get(key)
+    except Exception as e:
+        logger.warning(f"Artifact store unavailable, rendering {kind}: {str(e)}")
+        return render()
+    if data is not None:
+        logger.info(f"Artifact cache hit for {kind}")
+        return data
+
+    data = render()
+    try:
+        store.set(key, data)
+    except Exception as e:
+        logger.warning(f"Could not store {kind} artifact: {str(e)}")
+    return data
@@ -0,0 +1,141 @@
+import uuid
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.utils import timezone
+from django_redis import get_redis_connection
+from .pipeline import build_report, ReportDataMissing
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = 'report_jobs:queue'
+JOB_KEY = 'report_jobs:job:{}'
+INFLIGHT_KEY = 'report_jobs:inflight:{}'
+
+JOB_TTL = getattr(settings, 'REPORT_JOB_TTL', 24 * 60 * 60)
+# An identical request is folded into the running job until it finishes or this expires.
+INFLIGHT_TTL = getattr(settings, 'REPORT_JOB_INFLIGHT_TTL', 10 * 60)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+FINISHED = 'finished'
+FAILED = 'failed'
+
+def _redis():
+    return get_redis_connection('default')
+
+def job_fingerprint(symbol, report_format, initial_investment):
+    return hashlib.sha256(f"{symbol}|{report_format}|{initial_investment}".encode()).hexdigest()
+
+def enqueue_report_job(symbol, report_format, initial_investment):
+    """
+    Queue a report job and return (job_id, created).
+
+    If an identical job is already queued or running, its id is returned
+    instead and nothing new is queued.
+    """
+    redis = _redis()
+    fingerprint = job_fingerprint(symbol, report_format, initial_investment)
+    inflight_key = INFLIGHT_KEY.format(fingerprint)
+
+    job_id = uuid.uuid4().hex
+    while not redis.set(inflight_key, job_id, nx=True, ex=INFLIGHT_TTL):
+        existing = redis.get(inflight_key)
+        if existing is not None:
+            logger.info(f"Report job for {symbol} already in flight: {existing.decode()}")
+            return existing.decode(), False
+
+    job = {
+        'job_id': job_id,
+        'status': QUEUED,
+        'symbol': symbol,
+        'format': report_format,
+        'initial_investment': str(initial_investment),
+        'fingerprint': fingerprint,
+        'created_at': timezone.now().isoformat(),
+    }
+    pipe = redis.pipeline()
+    pipe.hset(JOB_KEY.format(job_id), mapping=job)
+    pipe.expire(JOB_KEY.format(job_id), JOB_TTL)
+    pipe.lpush(QUEUE_KEY, job_id)
+    pipe.execute()
+    logger.info(f"Queued report job {job_id} for {symbol} ({report_format})")
+    return job_id, True
+
+def get_job(job_id):
+    job = _redis().hgetall(JOB_KEY.format(job_id))
+    if not job:
+        return None
+    return {key.decode(): value.decode() for key, value in job.items()}
+
+def get_job_artifact(job):
+    """
+    The output of a finished job, read from the report cache it was stored in: the
+    JSON report dict or the PDF bytes, or None once the cache entry has expired.
+    """
+    return cache.get(job['report_key'])
+
+def _update_job(redis, job_id, **fields):
+    redis.hset(JOB_KEY.format(job_id), mapping=fields)
+
+def run_job(job_id):
+    from app.core.providers import ReportStageTimeout
+
+    redis = _redis()
+    job = get_job(job_id)
+    if job is None:
+        logger.warning(f"Report job {job_id} expired before it could run")
+        return
+
+    _update_job(redis, job_id, status=RUNNING, started_at=timezone.now().isoformat())
+    close_old_connections()
+    try:
+        report_key = build_report(job['symbol'], job['format'], job['initial_investment'])
+        _update_job(redis, job_id, status=FINISHED, report_key=report_key, finished_at=timezone.now().isoformat())
+        logger.info(f"Report job {job_id} for {job['symbol']} finished")
+    except (ReportDataMissing, ReportStageTimeout) as e:
+        logger.warning(f"Report job {job_id} for {job['symbol']} failed: {str(e)}")
+        _update_job(redis, job_id, status=FAILED, error=str(e), finished_at=timezone.now().isoformat())
+    except Exception as e:
+        logger.error(f"Error running report job {job_id} for {job['symbol']}: {str(e)}")
+        _update_job(redis, job_id, status=FAILED, error="Failed to generate report.",
+                    finished_at=timezone.now().isoformat())
+    finally:
+        inflight_key = INFLIGHT_KEY.format(job['fingerprint'])
+        if redis.get(inflight_key) == job_id.encode():
+            redis.delete(inflight_key)
+        close_old_connections()
+
+class ReportWorkerPool:
+    """Pulls report jobs off the Redis queue and renders at most `concurrency` of them at a time."""
+
+    def __init__(self, concurrency=1, poll_timeout=5):
+        self.concurrency = concurrency
+        self.poll_timeout = poll_timeout
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.stopping = threading.Event()
+
+    def _release(self, future):
+        self.slots.release()
+
+    def run(self):
+        redis = _redis()
+        logger.info(f"Report worker started with concurrency {self.concurrency}")
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='report-worker') as executor:
+            while not self.stopping.is_set():
+                # Only take a job off the queue once a slot is free, so waiting jobs stay visible to other workers.
+                self.slots.acquire()
+                popped = redis.brpop(QUEUE_KEY, timeout=self.poll_timeout)
+                if popped is None:
+                    self.slots.release()
+                    continue
+                job_id = popped[1].decode()
+                executor.submit(run_job, job_id).add_done_callback(self._release)
+        logger.info("Report worker stopped")
+
+    def stop(self):
+        self.stopping.set()
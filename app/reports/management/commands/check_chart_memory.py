@@ -0,0 +1,64 @@
+import gc
+import time
+import resource
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from matplotlib.figure import Figure
+from app.reports.visualizations import history_series, downsample_series, history_figure, render_figure_variants
+from app.reports.report_generator import CHART_VARIANTS
+
+def sample_history(bars=500, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, bars)))
+    dates = pd.date_range('2022-01-01', periods=bars, freq='D')
+    return {'timestamp': dates.as_unit('ns').asi8, 'close': close}
+
+def peak_rss_mb():
+    # ru_maxrss is reported in KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def live_figures():
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, Figure))
+
+class Command(BaseCommand):
+    help = "Render many charts from a thread pool and fail if figures or resident memory accumulate."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--charts', type=int, default=1000)
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument('--warmup', type=int, default=50)
+        parser.add_argument('--budget-mb', type=float, default=25.0)
+
+    def handle(self, *args, **options):
+        history = sample_history()
+
+        # The render path of generate_report, without the artifact cache in front of it.
+        def render(_):
+            figure = history_figure(downsample_series(history_series(history)))
+            return sum(len(chart) for chart in render_figure_variants(figure, CHART_VARIANTS).values())
+
+        with ThreadPoolExecutor(max_workers=options['threads']) as executor:
+            list(executor.map(render, range(options['warmup'])))
+            gc.collect()
+            baseline = peak_rss_mb()
+
+            started = time.perf_counter()
+            sizes = list(executor.map(render, range(options['charts'])))
+            elapsed = time.perf_counter() - started
+
+        gc.collect()
+        peak = peak_rss_mb()
+        growth_mb = peak - baseline
+        figures = live_figures()
+        self.stdout.write(
+            f"Rendered {len(sizes)} charts in {elapsed:.1f}s on {options['threads']} threads; "
+            f"average size {sum(sizes) / len(sizes) / 1024:.0f} KiB base64; "
+            f"peak RSS growth {growth_mb:.1f} MiB (peak {peak:.0f} MiB); live figures {figures}"
+        )
+
+        if figures:
+            raise CommandError(f"{figures} figures are still alive after rendering")
+        if growth_mb > options['budget_mb']:
+            raise CommandError(f"Peak RSS grew by {growth_mb:.1f} MiB, budget is {options['budget_mb']} MiB")
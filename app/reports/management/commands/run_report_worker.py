@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from app.reports.jobs import ReportWorkerPool
+
+class Command(BaseCommand):
+    help = "Run a local worker pool that renders queued report jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=getattr(settings, 'REPORT_WORKER_CONCURRENCY', 2))
+        parser.add_argument('--poll-timeout', type=int, default=5)
+
+    def handle(self, *args, **options):
+        pool = ReportWorkerPool(concurrency=options['concurrency'], poll_timeout=options['poll_timeout'])
+        self.stdout.write(f"Report worker running with concurrency {options['concurrency']}")
+        try:
+            pool.run()
+        except KeyboardInterrupt:
+            pool.stop()
+            self.stdout.write("Report worker shutting down")
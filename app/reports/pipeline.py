@@ -0,0 +1,56 @@
+import logging
+from django.core.cache import cache
+from app.core.models import StockReport
+from app.core.caching import versioned_key
+
+logger = logging.getLogger(__name__)
+
+REPORT_CACHE_TIMEOUT = 60 * 60
+
+class ReportDataMissing(Exception):
+    pass
+
+def report_cache_key(symbol, initial_investment, report_format):
+    return versioned_key('report', symbol, initial_investment, report_format)
+
+def get_cached_report(symbol, initial_investment, report_format):
+    """Return the cached JSON report dict or PDF bytes, or None."""
+    return cache.get(report_cache_key(symbol, initial_investment, report_format))
+
+def build_report(symbol, report_format, initial_investment):
+    """
+    Gather the inputs, render the report, store it and cache the requested format.
+
+    Returns the cache key holding the JSON report dict ('json') or the PDF bytes ('pdf').
+    """
+    # Only report workers need the data providers and the plotting/PDF stack; the API just reads the cache.
+    from app.core.providers import get_report_data_provider, gather_report_inputs
+    from .report_generator import generate_report, report_record
+
+    inputs = gather_report_inputs(get_report_data_provider(), symbol, initial_investment)
+    stock_data = inputs['historical_data']
+    stock_prediction = inputs['predictions']
+    backtest_data = inputs['backtest']
+
+    if stock_data is None or not len(stock_data['timestamp']) or not stock_prediction:
+        logger.warning(f"Missing data for symbol: {symbol}")
+        raise ReportDataMissing("Stock data or predictions not found.")
+
+    report_data, html_report, pdf_output = generate_report(
+        symbol=symbol,
+        historical_data=stock_data,
+        predictions=stock_prediction,
+        backtest_data=backtest_data,
+        render_pdf=report_format == 'pdf'
+    )
+
+    report, created = StockReport.objects.update_or_create(
+        symbol=symbol,
+        defaults={'report_data': report_record(report_data)}
+    )
+    logger.info(f"Report for {symbol} {'created' if created else 'updated'} in the database")
+
+    artifact = report_data if report_format == 'json' else pdf_output.getvalue()
+    key = report_cache_key(symbol, initial_investment, report_format)
+    cache.set(key, artifact, timeout=REPORT_CACHE_TIMEOUT)
+    return key
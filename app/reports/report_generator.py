@@ -1,37 +1,146 @@
-from django.template.loader import render_to_string
-from .visualizations import generate_stock_price_history_chart, generate_prediction_vs_actual_chart
-from weasyprint import HTML
+import hashlib
+from django.template.loader import get_template, render_to_string
+import numpy as np
+from app.core.series_store import get_series
+from django.urls import reverse
+from .visualizations import (
+    history_series, prediction_series, realized_series, downsample_series, series_points, history_figure, prediction_figure,
+    render_figure_variants, JSON_CHART_FORMAT, JSON_CHART_DPI, PDF_CHART_FORMAT, PDF_CHART_DPI, MIME_TYPES, CHART_AVERAGE_WINDOW,
+)
+from .summary import summarize_history, downsample_history, downsample_rows
+from .artifacts import cached_artifact
 from io import BytesIO
 
-def generate_report(symbol, historical_data, predictions, backtest_data):
-    
-    report_template = "../templates/reports/report_template.html"
-    
-    history_chart = generate_stock_price_history_chart(historical_data)
-    prediction_chart = generate_prediction_vs_actual_chart(predictions, historical_data)
-    
+REPORT_TEMPLATE = "../templates/reports/report_template.html"
+
+# JSON reports carry a light PNG; the PDF embeds a vector chart.
+CHART_VARIANTS = {
+    'json': (JSON_CHART_FORMAT, JSON_CHART_DPI),
+    'pdf': (PDF_CHART_FORMAT, PDF_CHART_DPI),
+}
+
+def render_chart_variants(kind, build_figure, data):
+    """
+    Encode a chart for every variant, reusing stored renders of the same input data.
+
+    The figure is only built if at least one variant misses the artifact cache,
+    and it is built and encoded once for all of them.
+    """
+    rendered = None
+
+    def render(name):
+        nonlocal rendered
+        if rendered is None:
+            rendered = render_figure_variants(build_figure(), CHART_VARIANTS)
+        return rendered[name].encode()
+
+    return {
+        name: cached_artifact(kind, [data, image_format, dpi], lambda: render(name)).decode()
+        for name, (image_format, dpi) in CHART_VARIANTS.items()
+    }
+
+def template_digest(template_name):
+    """Hash of a template's source, so stored renders are keyed by what the template says rather than its path."""
+    return hashlib.sha256(get_template(template_name).template.source.encode()).hexdigest()
+
+def stored_moving_average(symbol, historical_data):
+    """
+    The series store's chart SMA for a symbol if it covers exactly the bars of historical_data, else None.
+
+    The charts then fall back to computing the average themselves, e.g. for
+    data fetched from a remote API.
+    """
+    name = f'sma_{CHART_AVERAGE_WINDOW}'
+    try:
+        stored = get_series(symbol, columns=('timestamp', name))
+    except OSError:
+        return None
+    if stored is None or not np.array_equal(stored['timestamp'], historical_data['timestamp']):
+        return None
+    return stored[name]
+
+def history_range(symbol, summary):
+    """Where the full history behind a report lives, instead of embedding every bar."""
+    if not summary:
+        return {}
+    return {
+        "start": summary['start'],
+        "end": summary['end'],
+        "bars": summary['bars'],
+        "url": f"{reverse('stock-prices-symbol', args=[symbol])}?start={summary['start']}&end={summary['end']}",
+    }
+
+def generate_report(symbol, historical_data, predictions, backtest_data, render_pdf=True):
+    """
+    Build the JSON report and optionally the PDF for a symbol.
+
+    historical_data holds the price columns of the series store (see
+    HISTORY_COLUMNS in app.core.providers). Summary statistics and LTTB
+    sampling run vectorized over those arrays, only the sampled bars become
+    rows, and charts are drawn from downsampled lines, so rendering, storage
+    and transfer stay roughly constant as the history grows. The full history
+    is referenced by date range.
+    """
+    history = downsample_series(history_series(historical_data, stored_moving_average(symbol, historical_data)))
+    predicted = downsample_series(prediction_series(predictions))
+    realized = downsample_series(realized_series(predictions))
+    history_points, predicted_points = series_points(history), series_points(predicted)
+    realized_points = series_points(realized)
+
+    history_chart = render_chart_variants('history-chart', lambda: history_figure(history), history_points)
+    prediction_chart = render_chart_variants(
+        'prediction-chart', lambda: prediction_figure(predicted, history, realized),
+        [predicted_points, history_points, realized_points]
+    )
+
+    summary = summarize_history(historical_data)
     json_report = {
         "symbol": symbol,
-        "historical_data": historical_data,
-        "predictions": predictions,
+        "summary": summary,
+        "historical_data": {
+            "range": history_range(symbol, summary),
+            "sampled": downsample_history(symbol, historical_data),
+        },
+        "predictions": {
+            "count": len(predictions),
+            "sampled": downsample_rows(predictions, 'prediction_date', 'predicted_price'),
+        },
         "backtest": backtest_data,
         "charts": {
-            "history_chart": history_chart,
-            "prediction_vs_actual_chart": prediction_chart,
+            "history_chart": history_chart['json'],
+            "prediction_vs_actual_chart": prediction_chart['json'],
         }
     }
-    
-    html_report = render_to_string(report_template, {
-        "symbol": symbol,
-        "historical_data": historical_data,
-        "predictions": predictions,
-        "backtest": backtest_data,
-        "history_chart": history_chart,
-        "prediction_vs_actual_chart": prediction_chart
-    })
-    
-    pdf_output = BytesIO()
-    HTML(string=html_report).write_pdf(pdf_output)
-    pdf_output.seek(0)
-
-    return json_report, html_report, pdf_output
+
+    if not render_pdf:
+        return json_report, None, None
+
+    html_report = None
+
+    def render():
+        # WeasyPrint and its native libraries are only loaded for PDF output.
+        from weasyprint import HTML
+
+        nonlocal html_report
+        html_report = render_to_string(REPORT_TEMPLATE, {
+            "symbol": symbol,
+            "summary": summary,
+            "backtest": backtest_data,
+            "history_chart": history_chart['pdf'],
+            "prediction_vs_actual_chart": prediction_chart['pdf'],
+            "chart_mime_type": MIME_TYPES[PDF_CHART_FORMAT],
+        })
+        return HTML(string=html_report).write_pdf()
+
+    pdf_bytes = cached_artifact(
+        'report-pdf',
+        [symbol, summary, history_points, predicted_points, realized_points, backtest_data, CHART_VARIANTS['pdf'],
+         template_digest(REPORT_TEMPLATE)],
+        render
+    )
+
+    return json_report, html_report, BytesIO(pdf_bytes)
+
+def report_record(json_report):
+    """What StockReport keeps of a JSON report: everything but the embedded charts, which can be re-rendered."""
+    return {key: value for key, value in json_report.items() if key != 'charts'}
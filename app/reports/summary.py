@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+# Points kept per series in JSON reports; charts keep CHART_MAX_POINTS in visualizations.
+REPORT_SAMPLE_POINTS = 300
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling: indices of `threshold` points of (x, y).
+
+    The first and last points are kept; every bucket in between contributes the
+    point forming the largest triangle with the previously kept point and the
+    average of the next bucket, which preserves peaks and troughs. O(len(x)).
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Bucket i spans edges[i]:edges[i + 1]; the last one is followed by the final point.
+    every = (n - 2) / (threshold - 2)
+    edges = np.minimum((np.arange(threshold) * every).astype(np.intp) + 1, n)
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_x, next_y = x[end:edges[bucket + 2]].mean(), y[end:edges[bucket + 2]].mean()
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+def downsample_rows(rows, x_field, y_field, threshold=REPORT_SAMPLE_POINTS):
+    """Keep `threshold` of a list of dicts, chosen by LTTB on (x_field as a date, y_field)."""
+    if len(rows) <= threshold:
+        return list(rows)
+    x = pd.to_datetime([row[x_field] for row in rows], utc=True).as_unit('ns').asi8
+    y = pd.to_numeric([row[y_field] for row in rows])
+    return [rows[i] for i in lttb(x, y, threshold)]
+
+def _date(timestamp):
+    return pd.Timestamp(int(timestamp), tz='UTC').date().isoformat()
+
+def downsample_history(symbol, history, threshold=REPORT_SAMPLE_POINTS):
+    """
+    Keep `threshold` bars of price columns, chosen by LTTB on (timestamp, close).
+
+    Only the kept bars are turned into rows, in the shape the price endpoints return.
+    """
+    index = lttb(history['timestamp'], history['close'], threshold)
+    timestamps = pd.to_datetime(history['timestamp'][index], utc=True)
+    return [
+        {
+            'symbol': symbol,
+            'timestamp': timestamp.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            **{field: f"{history[field][i]:.4f}" for field in ('open', 'close', 'high', 'low')},
+            'volume': int(history['volume'][i]),
+        }
+        for i, timestamp in zip(index, timestamps)
+    ]
+
+def summarize_history(history):
+    """Summary statistics of price columns (timestamp as int64 ns, close, optional volume), or {} when empty."""
+    timestamps = history['timestamp']
+    if not len(timestamps):
+        return {}
+    close = np.asarray(history['close'], dtype=np.float64)
+    returns = np.diff(np.log(close))
+    high, low = int(np.argmax(close)), int(np.argmin(close))
+
+    summary = {
+        'start': _date(timestamps[0]),
+        'end': _date(timestamps[-1]),
+        'bars': len(close),
+        'first_close': round(float(close[0]), 4),
+        'last_close': round(float(close[-1]), 4),
+        'change_percentage': round(float((close[-1] / close[0] - 1) * 100), 2),
+        'high': {'date': _date(timestamps[high]), 'close': round(float(close[high]), 4)},
+        'low': {'date': _date(timestamps[low]), 'close': round(float(close[low]), 4)},
+        'mean_close': round(float(close.mean()), 4),
+        'annualized_volatility_percentage': round(float(returns.std() * np.sqrt(TRADING_DAYS) * 100), 2) if len(returns) > 1 else None,
+    }
+    if 'volume' in history:
+        summary['average_volume'] = int(np.mean(history['volume']))
+    return summary
@@ -1,66 +1,129 @@
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import matplotlib.dates as mdates
 import io
 import base64
+import numpy as np
 import pandas as pd
 import matplotlib.ticker as ticker
 from matplotlib.ticker import ScalarFormatter
+from .summary import lttb
 
-def generate_stock_price_history_chart(historical_data):
-    plt.figure(figsize=(10, 6))
-    
-    dates = pd.to_datetime([data['timestamp'] for data in historical_data])
-    prices = [data['close'] for data in historical_data]
-    historical_df = pd.DataFrame({'date': dates, 'price': prices})
-    historical_df['rolling_avg'] = historical_df['price'].rolling(window=30, min_periods=1).mean()
-    
-    plt.plot(historical_df['date'], historical_df['rolling_avg'], label='30-Day Rolling Avg', color='blue')
-    plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-    plt.gca().xaxis.set_major_locator(mdates.MonthLocator())
-    plt.grid(True, which='both', linestyle='--', linewidth=0.5)
-    plt.gca().yaxis.set_major_formatter(ScalarFormatter(useOffset=False))
-    plt.gca().yaxis.set_major_locator(ticker.MaxNLocator(nbins=8))
-    plt.xlabel('Date', fontsize=12)
-    plt.ylabel('Price', fontsize=12)
-    plt.title('Historical Stock Prices (30-Day Rolling Average)', fontsize=14)
-    plt.xticks(rotation=45)
-    plt.legend(loc='upper left')
-
-    return get_image_as_base64()
-
-def generate_prediction_vs_actual_chart(predictions, actual_prices):
-    plt.figure(figsize=(10, 6))
-    
+# Charts are built on standalone Figure objects rather than pyplot, so nothing is
+# registered globally: rendering is safe from several threads and each figure is
+# freed as soon as it goes out of scope.
+JSON_CHART_FORMAT = 'png'
+JSON_CHART_DPI = 100
+PDF_CHART_FORMAT = 'svg'
+PDF_CHART_DPI = 150
+
+CHART_AVERAGE_WINDOW = 30
+# Lines are downsampled to this many points before plotting.
+CHART_MAX_POINTS = 500
+# Date ticks per chart; a fixed monthly locator would draw hundreds on long histories.
+CHART_MAX_DATE_TICKS = 12
+
+MIME_TYPES = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+    'jpg': 'image/jpeg',
+}
+
+def _new_axes():
+    figure = Figure(figsize=(10, 6))
+    FigureCanvasAgg(figure)
+    return figure, figure.add_subplot()
+
+def _style_axes(axes, title):
+    axes.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+    axes.xaxis.set_major_locator(mdates.AutoDateLocator(maxticks=CHART_MAX_DATE_TICKS))
+    axes.grid(True, which='both', linestyle='--', linewidth=0.5)
+    axes.yaxis.set_major_formatter(ScalarFormatter(useOffset=False))
+    axes.yaxis.set_major_locator(ticker.MaxNLocator(nbins=8))
+    axes.set_xlabel('Date', fontsize=12)
+    axes.set_ylabel('Price', fontsize=12)
+    axes.set_title(title, fontsize=14)
+    axes.tick_params(axis='x', labelrotation=45)
+    axes.legend(loc='upper left')
+
+def _rolling_average(values, moving_average=None):
+    """
+    30-bar average with min_periods=1, reusing a stored SMA aligned with `values` when given.
+
+    A stored SMA is NaN until its window fills; those leading bars take the
+    expanding mean, which is what min_periods=1 produces there.
+    """
+    if moving_average is None:
+        return values.rolling(window=CHART_AVERAGE_WINDOW, min_periods=1).mean()
+    return pd.Series(moving_average, index=values.index).fillna(values.expanding().mean())
+
+def history_series(historical_data, moving_average=None):
+    """The plotted line of price columns (int64 ns timestamps, close): DataFrame(date, rolling_avg) of the 30-bar average close."""
+    dates = pd.to_datetime(historical_data['timestamp'], utc=True)
+    historical_df = pd.DataFrame({'date': dates, 'value': np.asarray(historical_data['close'], dtype=np.float64)})
+    historical_df['rolling_avg'] = _rolling_average(historical_df['value'], moving_average)
+    return historical_df[['date', 'rolling_avg']]
+
+def prediction_series(predictions):
+    """The plotted line of prediction rows: DataFrame(date, rolling_avg) of the 30-day average prediction."""
     prediction_dates = pd.to_datetime([pred['prediction_date'] for pred in predictions])
     predicted_prices = [pred['predicted_price'] for pred in predictions]
-    actual_dates = pd.to_datetime([actual['timestamp'] for actual in actual_prices])
-    actuals = [actual['close'] for actual in actual_prices]
-    actual_df = pd.DataFrame({'date': actual_dates, 'value': actuals})
-    prediction_df = pd.DataFrame({'date': prediction_dates, 'value': predicted_prices})
-    actual_df['rolling_avg'] = actual_df['value'].rolling(window=30, min_periods=1).mean()
-    prediction_df['rolling_avg'] = prediction_df['value'].rolling(window=30, min_periods=1).mean()
-
-    plt.plot(actual_df['date'], actual_df['rolling_avg'], label='Actual Prices (30-Day Avg)', color='blue')
-    plt.plot(prediction_df['date'], prediction_df['rolling_avg'], label='Predicted Prices (30-Day Avg)', linestyle='--', color='orange')
-    plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-    plt.gca().xaxis.set_major_locator(mdates.MonthLocator())
-    plt.grid(True, which='both', linestyle='--', linewidth=0.5)
-    plt.gca().yaxis.set_major_formatter(ScalarFormatter(useOffset=False))
-    plt.gca().yaxis.set_major_locator(ticker.MaxNLocator(nbins=8))
-    plt.xlabel('Date', fontsize=12)
-    plt.ylabel('Price', fontsize=12)
-    plt.title('Predicted vs Actual Stock Prices', fontsize=14)
-    plt.xticks(rotation=45)
-    plt.legend(loc='upper left')
-
-    return get_image_as_base64()
-
-def get_image_as_base64():
+    prediction_df = pd.DataFrame({'date': prediction_dates, 'value': pd.to_numeric(predicted_prices)})
+    prediction_df['rolling_avg'] = _rolling_average(prediction_df['value'])
+    return prediction_df[['date', 'rolling_avg']]
+
+def realized_series(predictions):
+    """
+    The realized prices of prediction rows, once backfilled: DataFrame(date, rolling_avg) of
+    the 30-day average actual price over the predictions that have one.
+    """
+    realized = [pred for pred in predictions if pred.get('actual_price') is not None]
+    realized_df = pd.DataFrame({
+        'date': pd.to_datetime([pred['prediction_date'] for pred in realized]),
+        'value': pd.to_numeric([pred['actual_price'] for pred in realized]),
+    })
+    realized_df['rolling_avg'] = _rolling_average(realized_df['value'])
+    return realized_df[['date', 'rolling_avg']]
+
+def downsample_series(series, max_points=CHART_MAX_POINTS):
+    """Reduce a plotted line to at most max_points with LTTB, so drawing cost does not grow with history."""
+    if len(series) <= max_points:
+        return series
+    x = pd.DatetimeIndex(series['date']).as_unit('ns').asi8
+    return series.iloc[lttb(x, series['rolling_avg'].to_numpy(), max_points)].reset_index(drop=True)
+
+def series_points(series):
+    """A plotted line as [[date, value], ...], e.g. to address its rendered chart."""
+    return [
+        [date.isoformat(), round(float(value), 4)]
+        for date, value in zip(series['date'], series['rolling_avg'])
+    ]
+
+def history_figure(history):
+    figure, axes = _new_axes()
+    axes.plot(history['date'], history['rolling_avg'], label='30-Day Rolling Avg', color='blue')
+    _style_axes(axes, 'Historical Stock Prices (30-Day Rolling Average)')
+    return figure
+
+def prediction_figure(predicted, actual, realized=None):
+    figure, axes = _new_axes()
+    axes.plot(actual['date'], actual['rolling_avg'], label='Actual Prices (30-Day Avg)', color='blue')
+    axes.plot(predicted['date'], predicted['rolling_avg'], label='Predicted Prices (30-Day Avg)', linestyle='--', color='orange')
+    if realized is not None and len(realized):
+        axes.plot(realized['date'], realized['rolling_avg'], label='Realized Prices (30-Day Avg)', color='green')
+    _style_axes(axes, 'Predicted vs Actual Stock Prices')
+    return figure
+
+def render_figure(figure, image_format=JSON_CHART_FORMAT, dpi=JSON_CHART_DPI):
+    """Encode a figure as a base64 string in the given format and DPI."""
+    figure.tight_layout()
     buffer = io.BytesIO()
-    plt.tight_layout()
-    plt.savefig(buffer, format='png', dpi=300)
-    buffer.seek(0)
-    image_png = buffer.getvalue()
-    buffer.close()
-    plt.clf()
-    return base64.b64encode(image_png).decode('utf-8')
+    figure.savefig(buffer, format=image_format, dpi=dpi)
+    return base64.b64encode(buffer.getvalue()).decode('utf-8')
+
+def render_figure_variants(figure, variants):
+    """Encode one figure several times, e.g. {'json': ('png', 100), 'pdf': ('svg', 150)}, then release it."""
+    try:
+        return {name: render_figure(figure, image_format, dpi) for name, (image_format, dpi) in variants.items()}
+    finally:
+        figure.clear()
@@ -19,7 +19,41 @@ SECRET_KEY = os.environ.get("DJANGO_SECRET_KEY")
 DEBUG = os.environ.get("DEBUG", "0") == "1"
 ALLOWED_HOSTS = os.environ.get("DJANGO_ALLOWED_HOSTS").split(" ")
 ALPHA_VANTAGE_API_KEY = os.environ.get("ALPHA_VANTAGE_API_KEY")
+ALPHA_VANTAGE_BASE_URL = os.environ.get("ALPHA_VANTAGE_BASE_URL") or 'https://www.alphavantage.co'
+# Bulk ingestion stays under the API key's quota (5 requests per minute on the free tier).
+ALPHA_VANTAGE_REQUESTS_PER_MINUTE = int(os.environ.get("ALPHA_VANTAGE_REQUESTS_PER_MINUTE", 5))
+INGESTION_CONCURRENCY = int(os.environ.get("INGESTION_CONCURRENCY", 4))
+# Bulk ingestion runs the prediction batch for the symbols it updated.
+PREDICT_AFTER_INGESTION = os.environ.get("PREDICT_AFTER_INGESTION", "1") == "1"
 API_BASE_URL = os.environ.get('API_BASE_URL')
+# 'local' builds reports in-process; 'remote' goes through the HTTP API at API_BASE_URL.
+REPORT_DATA_MODE = os.environ.get('REPORT_DATA_MODE') or 'local'
+# Report inputs are gathered concurrently on a bounded pool, each stage with its own timeout in seconds.
+REPORT_GATHER_WORKERS = int(os.environ.get('REPORT_GATHER_WORKERS', 8))
+REPORT_STAGE_TIMEOUTS = {
+    'historical_data': 30,
+    'predictions': 30,
+    'backtest': 30,
+}
+# Report jobs are queued in Redis and rendered by `manage.py run_report_worker`.
+REPORT_WORKER_CONCURRENCY = int(os.environ.get('REPORT_WORKER_CONCURRENCY', 2))
+# Rendered charts and PDFs are cached by content hash in 'redis' or under REPORT_ARTIFACT_DIR ('file').
+REPORT_ARTIFACT_STORE = os.environ.get('REPORT_ARTIFACT_STORE') or 'redis'
+REPORT_ARTIFACT_DIR = os.path.join(BASE_DIR, 'artifacts')
+REPORT_ARTIFACT_MAX_BYTES = int(os.environ.get('REPORT_ARTIFACT_MAX_BYTES', 256 * 2 ** 20))
+
+# Memory-mapped per-symbol price arrays, rebuilt from StockPrice on ingestion; must be shared by all workers.
+PRICE_SERIES_DIR = os.environ.get('PRICE_SERIES_DIR') or os.path.join(BASE_DIR, 'series')
+
+# Prediction models are <version>.pkl files in MODEL_DIR, loaded on first use and reloaded when the file changes.
+MODEL_DIR = os.environ.get('MODEL_DIR') or os.path.join(BASE_DIR, 'app', 'core', 'ml')
+MODEL_VERSION = os.environ.get('MODEL_VERSION') or 'model'
+# Per-symbol versions, e.g. "AAPL=v2,MSFT=v3"; other symbols use MODEL_VERSION.
+SYMBOL_MODEL_VERSIONS = dict(
+    pair.strip().split('=', 1) for pair in os.environ.get('SYMBOL_MODEL_VERSIONS', '').split(',') if '=' in pair
+)
+# Seconds between checks of a loaded model's file for changes.
+MODEL_RELOAD_INTERVAL = float(os.environ.get('MODEL_RELOAD_INTERVAL', 5))
 
 # Application definition
 
@@ -92,10 +126,17 @@ CACHES = {
         'LOCATION': os.environ.get("REDIS_URL"),
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'COMPRESSOR': 'django_redis.compressors.zlib.ZlibCompressor',
         }
     }
 }
 
+# Per-process LRU in front of Redis for hot keys, kept coherent through Redis pub/sub.
+CACHE_L1_MAX_BYTES = int(os.environ.get('CACHE_L1_MAX_BYTES', 32 * 2 ** 20))
+CACHE_L1_TTL = int(os.environ.get('CACHE_L1_TTL', 5))
+# Seconds between flushes of each process's cache hit/miss counters to Redis.
+CACHE_STATS_FLUSH_INTERVAL = int(os.environ.get('CACHE_STATS_FLUSH_INTERVAL', 10))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 